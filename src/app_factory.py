@@ -0,0 +1,118 @@
+"""Building application parts from settings.
+
+Nothing is created at import time: services start model worker threads and are created
+only by entrypoints, heavy libraries are imported inside those threads.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from http_integration.http_integration import HttpBatchApp
+from settings.settings import Settings
+from speech_recognition.diarization.resemblyzer_with_silero_vad_diarization_service import (
+    ResemblyzerWithSileroVADDiarizationService,
+)
+from speech_recognition.diarization.speaker_registry import SpeakerRegistry
+from speech_recognition.media.ffmpeg.ffmpeg_preparation_service import FfmpegPreparationService
+from speech_recognition.pipeline.services import PipelineServices
+from speech_recognition.thread_budget import ThreadBudget
+from speech_recognition.transcription.faster_whisper_service import FasterWhisperTranscriptionService
+
+if TYPE_CHECKING:
+    from aiogram.client.telegram import TelegramAPIServer
+
+    from telegram_integration.telegram_integration import TelegramBotApp
+
+
+def create_services(settings: Settings, budget: ThreadBudget | None = None) -> PipelineServices:
+    """Create model workers shared by all entrypoints of the process, budget is taken from settings by default."""
+    budget = budget or get_thread_budget(settings)
+    return PipelineServices(
+        FfmpegPreparationService(),
+        ResemblyzerWithSileroVADDiarizationService(
+            budget.diarization_threads,
+            budget.diarization_interop_threads,
+            settings.diarization_embeddings_engine,
+            settings.diarization_onnx_encoder_path,
+            get_speaker_registry(settings),
+            settings.speaker_match_threshold,
+        ),
+        FasterWhisperTranscriptionService(
+            device=settings.whisper_device,
+            batch_size=settings.whisper_batch_size,
+            batch_max_wait=settings.whisper_batch_max_wait_ms / 1000,
+            language=settings.whisper_language,
+            cpu_threads=budget.whisper_threads,
+            num_workers=budget.whisper_workers,
+        ),
+    )
+
+
+def get_thread_budget(settings: Settings) -> ThreadBudget:
+    """Split settings.cpu_threads (all cores by default) between model workers."""
+    return ThreadBudget.split(
+        settings.cpu_threads or os.cpu_count() or 1,
+        settings.whisper_workers,
+        settings.whisper_cpu_threads,
+        settings.diarization_cpu_threads,
+    )
+
+
+def get_speaker_registry(settings: Settings) -> SpeakerRegistry | None:
+    """Return registry of enrolled speakers, None if settings.speaker_registry_dir is not set."""
+    if settings.speaker_registry_dir is None:
+        return None
+    return SpeakerRegistry(settings.speaker_registry_dir, mmap=settings.speaker_registry_mmap)
+
+
+def create_telegram_app(settings: Settings, services: PipelineServices) -> "TelegramBotApp":
+    """Create telegram bot, settings.telegram_api_key must be set."""
+    # aiogram is slow to import and is not needed by http api and bulk workers
+    from telegram_integration.telegram_integration import TelegramBotApp  # noqa: PLC0415
+
+    if settings.telegram_api_key is None:
+        msg = "TELEGRAM API KEY NEEDED"
+        raise RuntimeError(msg)
+
+    return TelegramBotApp(
+        settings.telegram_api_key,
+        services,
+        get_api_server(settings),
+        settings.voice_fast_path_max_duration,
+        settings.telegram_jobs_dir,
+        settings.checkpoint_ttl_hours * 3600,
+    )
+
+
+def create_http_app(settings: Settings, services: PipelineServices) -> HttpBatchApp:
+    """Create http batch api."""
+    jobs_dir = settings.http_api_jobs_dir or Path(tempfile.mkdtemp(prefix="hush-jobs-"))
+    return HttpBatchApp(
+        services,
+        jobs_dir,
+        settings.http_api_local_files_dir,
+        settings.http_api_max_concurrent_jobs,
+        settings.checkpoint_ttl_hours * 3600,
+    )
+
+
+def get_api_server(settings: Settings) -> "TelegramAPIServer | None":
+    """Return self-hosted Bot API server or None for public one."""
+    from aiogram.client.telegram import SimpleFilesPathWrapper, TelegramAPIServer  # noqa: PLC0415
+
+    if settings.telegram_api_base_url is None:
+        return None
+
+    if settings.telegram_api_server_files_dir is not None and settings.telegram_api_local_files_dir is not None:
+        return TelegramAPIServer.from_base(
+            settings.telegram_api_base_url,
+            is_local=settings.telegram_api_local_mode,
+            wrap_local_file=SimpleFilesPathWrapper(
+                settings.telegram_api_server_files_dir,
+                settings.telegram_api_local_files_dir,
+            ),
+        )
+
+    return TelegramAPIServer.from_base(settings.telegram_api_base_url, is_local=settings.telegram_api_local_mode)
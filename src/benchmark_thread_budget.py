@@ -0,0 +1,94 @@
+"""Throughput of the pipeline with different CPU thread budgets.
+
+Every budget is measured in a fresh process, so native thread pools are configured from scratch.
+Budget is "workers:threads:diarization" - whisper workers, threads of every whisper worker
+and speaker embeddings threads, 0 keeps library default (every pool uses all cores).
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app_factory import create_services
+from bulk_integration.bulk_runner import BulkItem, BulkReport, BulkRunner, discover
+from settings.settings import Settings
+from speech_recognition.thread_budget import ThreadBudget
+
+logger = logging.getLogger(__name__)
+
+
+def parse_budget(value: str) -> ThreadBudget:
+    """Parse "workers:threads:diarization"."""
+    workers, threads, diarization = (int(part) for part in value.split(":"))
+    return ThreadBudget(workers, threads, diarization, 1 if diarization else 0)
+
+
+def default_budgets(cpu_threads: int) -> list[ThreadBudget]:
+    """Library defaults and even splits of cores between 1, 2 and 4 whisper workers."""
+    return [ThreadBudget()] + [ThreadBudget.split(cpu_threads, workers) for workers in (1, 2, 4)]
+
+
+def run_budget(
+    budget: ThreadBudget,
+    sources: list[Path],
+    inflight: int,
+    n_speakers: int | None,
+    settings: Settings,
+) -> BulkReport:
+    """Transcribe sources with budget, model loading and warm up are not measured."""
+    services = create_services(settings, budget)
+    runner = BulkRunner(services, inflight, n_speakers)
+
+    with tempfile.TemporaryDirectory(prefix="hush-benchmark-") as output_dir:
+        warm_up = BulkItem(sources[0], Path(output_dir) / "warm-up" / sources[0].name)
+        asyncio.run(runner.run([warm_up]))
+
+        items = [BulkItem(source, Path(output_dir) / str(index) / source.name) for index, source in enumerate(sources)]
+        return asyncio.run(runner.run(items))
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="Measure throughput with different CPU thread budgets.")
+    parser.add_argument("input", type=Path, help="directory with recordings or manifest file with one path per line")
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        action="append",
+        help='"workers:threads:diarization", can be repeated, library defaults and even splits if not set',
+    )
+    parser.add_argument("--cpu-threads", type=int, default=os.cpu_count() or 1, help="cores for default budgets")
+    parser.add_argument("--inflight", type=int, default=3, help="files processed at once")
+    parser.add_argument("--speakers", type=int, default=None, help="number of speakers, auto if not set")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    sources = [item.source for item in discover(args.input, Path())]
+    if not sources:
+        parser.error("no recordings found")
+
+    budgets: list[ThreadBudget] = args.budget or default_budgets(args.cpu_threads)
+    settings = Settings()
+    context = multiprocessing.get_context("spawn")
+
+    results: list[tuple[ThreadBudget, BulkReport]] = []
+    for budget in budgets:
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            report = executor.submit(run_budget, budget, sources, args.inflight, args.speakers, settings).result()
+        logger.info("%s: %s", budget, report)
+        results.append((budget, report))
+
+    print(f"{'budget':<48} {'cores':>5} {'audio-hours/hour':>17} {'failed':>7}")  # noqa: T201
+    for budget, report in results:
+        print(  # noqa: T201
+            f"{budget!s:<48} {budget.total or 'all':>5} {report.audio_hours_per_hour:>17.2f} {report.files_failed:>7}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from bulk_integration.bulk_integration import run_bulk
+from bulk_integration.bulk_runner import discover
+from settings.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# every worker gets own share of cpu threads, about 4 threads for whisper
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) // 6)
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="Transcribe directory or manifest of recordings.")
+    parser.add_argument("input", type=Path, help="directory with recordings or manifest file with one path per line")
+    parser.add_argument("output", type=Path, help="directory for results")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker processes, each loads models")
+    parser.add_argument("--inflight", type=int, default=3, help="files processed at once by one worker")
+    parser.add_argument("--speakers", type=int, default=None, help="number of speakers, auto if not set")
+    parser.add_argument("--device", default=None, help="device for whisper model, WHISPER_DEVICE by default")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+
+    items = discover(args.input, args.output)
+    logger.info("Found %d files", len(items))
+
+    settings = Settings()
+    if args.device is not None:
+        settings = settings.model_copy(update={"whisper_device": args.device})
+    # cores of the machine are shared by worker processes
+    cpu_threads = settings.cpu_threads or os.cpu_count() or 1
+    settings = settings.model_copy(update={"cpu_threads": max(1, cpu_threads // args.workers)})
+
+    report = run_bulk(items, args.workers, args.inflight, args.speakers, settings)
+    logger.info("Finished: %s", report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Bulk transcription in worker processes."""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from app_factory import create_services
+from settings.settings import Settings
+
+from .bulk_runner import BulkItem, BulkReport, BulkRunner
+
+if TYPE_CHECKING:
+    from queue import Queue
+
+logger = logging.getLogger(__name__)
+
+
+def run_bulk(
+    items: list[BulkItem],
+    workers: int,
+    inflight: int,
+    n_speakers: int | None = None,
+    settings: Settings | None = None,
+) -> BulkReport:
+    """Transcribe items in worker processes.
+
+    Every process loads own models and takes next file from shared queue when it has free slot,
+    so long and short files are balanced between processes.
+    """
+    pending = [item for item in items if not item.is_done()]
+    report = BulkReport(files_skipped=len(items) - len(pending))
+    if not pending:
+        return report
+
+    workers = min(workers, len(pending))
+    context = multiprocessing.get_context("spawn")
+    started = time.monotonic()
+
+    with context.Manager() as manager, ProcessPoolExecutor(workers, mp_context=context) as executor:
+        queue: Queue[BulkItem | None] = manager.Queue()
+        for item in pending:
+            queue.put(item)
+        for _ in range(workers * inflight):
+            queue.put(None)
+
+        futures = [
+            executor.submit(_run_worker, queue, inflight, n_speakers, settings or Settings()) for _ in range(workers)
+        ]
+        report = functools.reduce(BulkReport.merge, (future.result() for future in futures), report)
+
+    report.wall_seconds = time.monotonic() - started
+    return report
+
+
+def _run_worker(
+    queue: "Queue[BulkItem | None]",
+    inflight: int,
+    n_speakers: int | None,
+    settings: Settings,
+) -> BulkReport:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+
+    services = create_services(settings)
+    runner = BulkRunner(services, inflight, n_speakers, on_item_done=_log_progress)
+    return asyncio.run(runner.run(queue.get))
+
+
+def _log_progress(item: BulkItem, report: BulkReport) -> None:
+    logger.info("%s finished, worker stats: %s", item.source, report)
@@ -0,0 +1,177 @@
+"""Bulk transcription of many files."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from speech_recognition.output.full_output_pipeline import FullOutputPipeline
+from speech_recognition.pipeline.progress_observer import NullProgressObserver
+from speech_recognition.pipeline.services import PipelineServices
+
+logger = logging.getLogger(__name__)
+
+MEDIA_EXTENSIONS = frozenset(
+    {".aac", ".flac", ".m4a", ".mkv", ".mov", ".mp3", ".mp4", ".oga", ".ogg", ".opus", ".wav", ".webm", ".wma"},
+)
+OUTPUT_SUFFIXES = (".csv", ".txt", ".simple.txt")
+PARTIAL_SUFFIX = ".part"
+# results of manifest entries outside manifest directory keep their absolute path under this directory
+EXTERNAL_DIR = "_external"
+
+
+@dataclass(frozen=True)
+class BulkItem:
+    """One file for transcription."""
+
+    source: Path
+    output_base: Path
+
+    def output_paths(self) -> tuple[Path, Path, Path]:
+        """Return paths of csv, txt and simple txt results."""
+        csv_path, txt_path, simple_txt_path = (
+            self.output_base.with_name(self.output_base.name + suffix) for suffix in OUTPUT_SUFFIXES
+        )
+        return csv_path, txt_path, simple_txt_path
+
+    def is_done(self) -> bool:
+        """All results exist. Results are renamed from partial files only after successful run."""
+        return all(path.exists() for path in self.output_paths())
+
+
+@dataclass
+class BulkReport:
+    """Aggregated statistics of bulk run."""
+
+    files_done: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def audio_hours_per_hour(self) -> float:
+        """Throughput: hours of audio transcribed in one hour."""
+        if self.wall_seconds == 0:
+            return 0.0
+        return self.audio_seconds / self.wall_seconds
+
+    def merge(self, other: "BulkReport") -> "BulkReport":
+        """Sum counters of two reports, wall time is not summed."""
+        return BulkReport(
+            self.files_done + other.files_done,
+            self.files_skipped + other.files_skipped,
+            self.files_failed + other.files_failed,
+            self.audio_seconds + other.audio_seconds,
+            max(self.wall_seconds, other.wall_seconds),
+        )
+
+    def __str__(self) -> str:  # noqa: D105
+        return (
+            f"done: {self.files_done}, skipped: {self.files_skipped}, failed: {self.files_failed}, "
+            f"audio: {self.audio_seconds / 3600:.2f} h, wall: {self.wall_seconds / 3600:.2f} h, "
+            f"throughput: {self.audio_hours_per_hour:.2f} audio-hours/hour"
+        )
+
+
+def discover(input_path: Path, output_dir: Path) -> list[BulkItem]:
+    """Return items for every media file in directory or every path in manifest file.
+
+    Manifest is a text file with one path per line, relative paths are resolved against manifest directory.
+    Results are placed into output_dir keeping directory structure relative to input,
+    results of files outside input directory keep their whole absolute path under output_dir / EXTERNAL_DIR.
+    """
+    if input_path.is_dir():
+        sources = sorted(
+            path for path in input_path.rglob("*") if path.is_file() and path.suffix.lower() in MEDIA_EXTENSIONS
+        )
+        base_dir = input_path
+    else:
+        lines = input_path.read_text(encoding="utf-8").splitlines()
+        sources = [input_path.parent / line.strip() for line in lines if line.strip() and not line.startswith("#")]
+        base_dir = input_path.parent
+
+    base_dir = base_dir.resolve()
+    items: list[BulkItem] = []
+    for source in sources:
+        resolved = source.resolve()
+        if resolved.is_relative_to(base_dir):
+            relative = resolved.relative_to(base_dir)
+        else:
+            relative = Path(EXTERNAL_DIR) / resolved.relative_to(resolved.anchor)
+        items.append(BulkItem(source, output_dir / relative))
+
+    return items
+
+
+class BulkRunner:
+    """Run many pipelines at once, so stages of neighbour files overlap.
+
+    Every service has own worker, so with inflight=3 file N+1 is prepared by ffmpeg
+    while file N is transcribed and file N-1 is diarized.
+    """
+
+    def __init__(
+        self,
+        services: PipelineServices,
+        inflight: int = 3,
+        n_speakers: int | None = None,
+        on_item_done: Callable[[BulkItem, BulkReport], None] | None = None,
+    ) -> None:
+        """Init runner."""
+        self._services = services
+        self._inflight = inflight
+        self._n_speakers = n_speakers
+        self._on_item_done = on_item_done
+
+    async def run(self, items: Iterable[BulkItem] | Callable[[], BulkItem | None]) -> BulkReport:
+        """Transcribe items, already transcribed ones are skipped.
+
+        Items can be passed as iterable or as blocking function returning next item or None at the end.
+        """
+        get_next = items if callable(items) else _next_getter(items)
+        report = BulkReport()
+        started = time.monotonic()
+
+        async def worker() -> None:
+            while (item := await asyncio.to_thread(get_next)) is not None:
+                await self._run_item(item, report)
+                report.wall_seconds = time.monotonic() - started
+                if self._on_item_done is not None:
+                    self._on_item_done(item, report)
+
+        await asyncio.gather(*(worker() for _ in range(self._inflight)))
+        report.wall_seconds = time.monotonic() - started
+        return report
+
+    async def _run_item(self, item: BulkItem, report: BulkReport) -> None:
+        if await asyncio.to_thread(item.is_done):
+            report.files_skipped += 1
+            return
+
+        output_paths = item.output_paths()
+        partial_paths = [path.with_name(path.name + PARTIAL_SUFFIX) for path in output_paths]
+        try:
+            duration = await self._services.preparation.get_duration(item.source)
+            await asyncio.to_thread(item.output_base.parent.mkdir, parents=True, exist_ok=True)
+
+            async with FullOutputPipeline(*partial_paths) as output:
+                pipeline = self._services.get_pipeline(output, NullProgressObserver())
+                await pipeline.run_pipeline(item.source, self._n_speakers)
+
+            for partial_path, output_path in zip(partial_paths, output_paths, strict=True):
+                await asyncio.to_thread(partial_path.replace, output_path)
+        except Exception:
+            logger.exception("Failed to transcribe %s", item.source)
+            report.files_failed += 1
+            return
+
+        report.files_done += 1
+        report.audio_seconds += duration
+
+
+def _next_getter(items: Iterable[BulkItem]) -> Callable[[], BulkItem | None]:
+    iterator = iter(items)
+    return lambda: next(iterator, None)
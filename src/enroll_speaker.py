@@ -0,0 +1,73 @@
+"""Enroll speakers in registry from recordings where only they speak.
+
+    uv run src/enroll_speaker.py enroll "Ivan Petrov" ivan-1.ogg ivan-2.ogg
+    uv run src/enroll_speaker.py remove "Ivan Petrov"
+    uv run src/enroll_speaker.py list
+
+Registry directory, embeddings engine and ONNX encoder path are taken from settings.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from settings.settings import Settings
+from speech_recognition.diarization.interfaces import SpeakerEncoder
+from speech_recognition.diarization.resemblyzer_with_silero_vad_diarization_service import create_speaker_encoder
+from speech_recognition.diarization.speaker_registry import SpeakerRegistry
+
+SAMPLE_RATE = 16000
+
+
+def embed_speech(paths: list[Path], encoder: SpeakerEncoder) -> npt.NDArray[np.float32]:
+    """Return embedding of speech of every recording, silence is cut by vad."""
+    import librosa  # noqa: PLC0415
+    import torch  # noqa: PLC0415
+    from silero_vad import (  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+        get_speech_timestamps,  # pyright: ignore[reportUnknownVariableType]
+        load_silero_vad,
+    )
+
+    vad_model = load_silero_vad(onnx=True)  # pyright: ignore[reportUnknownVariableType]
+    speech: list[npt.NDArray[np.float32]] = []
+    for path in paths:
+        wav, _ = librosa.load(path, sr=SAMPLE_RATE, mono=True)
+        timestamps = get_speech_timestamps(torch.from_numpy(wav).float(), vad_model)  # pyright: ignore[reportUnknownVariableType, reportUnknownMemberType]
+        if timestamps:
+            speech.append(np.concatenate([wav[item["start"] : item["end"]] for item in timestamps]))  # pyright: ignore[reportUnknownArgumentType]
+
+    return encoder.embed_utterances(speech)
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="Manage enrolled speakers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    enroll = commands.add_parser("enroll", help="add speaker or replace their voice")
+    enroll.add_argument("name")
+    enroll.add_argument("recordings", type=Path, nargs="+", help="recordings with only this speaker")
+    remove = commands.add_parser("remove", help="remove speaker")
+    remove.add_argument("name")
+    commands.add_parser("list", help="print enrolled speakers")
+    args = parser.parse_args()
+
+    settings = Settings()
+    if settings.speaker_registry_dir is None:
+        parser.error("SPEAKER_REGISTRY_DIR is not set")
+    registry = SpeakerRegistry(settings.speaker_registry_dir)
+
+    if args.command == "enroll":
+        encoder = create_speaker_encoder(settings.diarization_embeddings_engine, settings.diarization_onnx_encoder_path)
+        embeddings = embed_speech(args.recordings, encoder)
+        if not len(embeddings):
+            parser.error("no speech found in recordings")
+        registry.enroll(args.name, embeddings)
+    elif args.command == "remove" and not registry.remove(args.name):
+        parser.error(f"{args.name} is not enrolled")
+    elif args.command == "list":
+        print("\n".join(registry.names))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import argparse
+from pathlib import Path
+
+from speech_recognition.diarization.onnx_speaker_encoder import export_voice_encoder
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="Export resemblyzer voice encoder to ONNX.")
+    parser.add_argument("output", type=Path, nargs="?", default=Path("./models/voice_encoder.onnx"))
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    export_voice_encoder(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import shutil
+from pathlib import Path
+from typing import cast
+
+import aiofiles
+from aiohttp import BodyPartReader, web
+
+from speech_recognition.pipeline.services import PipelineServices
+
+from .jobs import Job, JobManager, JobStatus, ResultFormat
+
+RESULT_CONTENT_TYPES = {
+    ResultFormat.CSV: "text/csv",
+    ResultFormat.TXT: "text/plain",
+    ResultFormat.SIMPLE_TXT: "text/plain",
+    ResultFormat.JSON: "application/json",
+}
+
+
+class HttpBatchApp:
+    """HTTP API for batch transcription.
+
+    POST /jobs                  upload files (multipart "file" fields) or pass local paths (JSON {"paths": [...]})
+    GET /jobs/{job_id}          job state
+    GET /jobs/{job_id}/events   job progress as server-sent events
+    GET /jobs/{job_id}/result   result file, ?format=csv|txt|simple_txt|json
+    DELETE /jobs/{job_id}       remove finished job
+    """
+
+    def __init__(
+        self,
+        services: PipelineServices,
+        jobs_dir: Path,
+        local_files_dir: Path | None = None,
+        max_concurrent_jobs: int = 4,
+        checkpoint_ttl: float = 3 * 24 * 3600,
+    ) -> None:
+        """Init http app.
+
+        Local paths are accepted only inside local_files_dir, without it only uploads are allowed.
+        Jobs found in jobs_dir are restored on start, unfinished ones are continued.
+        """
+        self.jobs = JobManager(services, jobs_dir, max_concurrent_jobs, checkpoint_ttl)
+        self.local_files_dir = local_files_dir.resolve() if local_files_dir is not None else None
+        self.app = web.Application()
+
+        self.__register_handlers()
+
+    def __register_handlers(self) -> None:
+        self.app.router.add_post("/jobs", self.__create_jobs)
+        self.app.router.add_get("/jobs/{job_id}", self.__get_job)
+        self.app.router.add_get("/jobs/{job_id}/events", self.__job_events)
+        self.app.router.add_get("/jobs/{job_id}/result", self.__job_result)
+        self.app.router.add_delete("/jobs/{job_id}", self.__delete_job)
+
+    async def __create_jobs(self, request: web.Request) -> web.Response:
+        if request.content_type == "application/json":
+            jobs = await self.__create_jobs_from_paths(request)
+        elif request.content_type == "multipart/form-data":
+            jobs = await self.__create_jobs_from_uploads(request)
+        else:
+            raise web.HTTPUnsupportedMediaType(reason="Use multipart/form-data or application/json")
+
+        return web.json_response({"jobs": [job.to_dict() for job in jobs]}, status=web.HTTPAccepted.status_code)
+
+    async def __create_jobs_from_uploads(self, request: web.Request) -> list[Job]:
+        uploads: list[tuple[str, Path, Path, str]] = []
+        try:
+            n_speakers = await self.__read_uploads(request, uploads)
+        except BaseException:
+            # wrong request or dropped connection, files written before are not needed
+            for _, workdir, _, _ in uploads:
+                await asyncio.to_thread(shutil.rmtree, workdir, ignore_errors=True)
+            raise
+
+        if not uploads:
+            raise web.HTTPBadRequest(reason="No files")
+
+        return [
+            await self.jobs.submit(job_id, workdir, source, filename, n_speakers, owns_source=True)
+            for job_id, workdir, source, filename in uploads
+        ]
+
+    async def __read_uploads(self, request: web.Request, uploads: list[tuple[str, Path, Path, str]]) -> int | None:
+        """Write uploaded files to new job directories, appending them to uploads; return speakers."""
+        n_speakers = None
+        reader = await request.multipart()
+        while (part := await reader.next()) is not None:
+            if not isinstance(part, BodyPartReader):
+                continue
+
+            if part.name == "speakers":
+                n_speakers = self.__parse_speakers(await part.text())
+            elif part.name == "file" and part.filename:
+                filename = Path(part.filename).name
+                job_id, workdir = await self.jobs.new_workdir()
+                source = workdir / f"source{Path(filename).suffix}"
+                uploads.append((job_id, workdir, source, filename))
+                async with aiofiles.open(source, "wb") as file:
+                    while chunk := await part.read_chunk():
+                        await file.write(chunk)
+
+        return n_speakers
+
+    async def __create_jobs_from_paths(self, request: web.Request) -> list[Job]:
+        if self.local_files_dir is None:
+            raise web.HTTPForbidden(reason="Local paths are disabled")
+
+        try:
+            data = await request.json()
+        except json.JSONDecodeError as e:
+            raise web.HTTPBadRequest(reason="Wrong json") from e
+
+        fields = cast("dict[str, object]", data) if isinstance(data, dict) else {}
+        paths = fields.get("paths")
+        if not isinstance(paths, list) or not paths:
+            raise web.HTTPBadRequest(reason="No paths")
+
+        n_speakers = self.__parse_speakers(fields.get("speakers"))
+        sources: list[Path] = []
+        for path in cast("list[object]", paths):
+            source = await asyncio.to_thread(Path(str(path)).resolve)
+            if not source.is_relative_to(self.local_files_dir) or not await asyncio.to_thread(source.is_file):
+                raise web.HTTPBadRequest(reason=f"Wrong path: {path}")
+            sources.append(source)
+
+        jobs: list[Job] = []
+        for source in sources:
+            job_id, workdir = await self.jobs.new_workdir()
+            jobs.append(await self.jobs.submit(job_id, workdir, source, source.name, n_speakers, owns_source=False))
+
+        return jobs
+
+    async def __get_job(self, request: web.Request) -> web.Response:
+        job = self.__get_job_or_404(request)
+        return web.json_response(job.to_dict())
+
+    async def __job_events(self, request: web.Request) -> web.StreamResponse:
+        job = self.__get_job_or_404(request)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        sent = None
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda sent=sent: (job.status, job.percent) != sent)
+                sent = (job.status, job.percent)
+                state = job.to_dict()
+
+            await response.write(f"event: {state['status']}\ndata: {json.dumps(state)}\n\n".encode())
+            if job.is_finished:
+                break
+
+        await response.write_eof()
+        return response
+
+    async def __job_result(self, request: web.Request) -> web.FileResponse:
+        job = self.__get_job_or_404(request)
+
+        try:
+            result_format = ResultFormat(request.query.get("format", ResultFormat.JSON))
+        except ValueError as e:
+            raise web.HTTPBadRequest(reason="Unknown format") from e
+
+        if job.status != JobStatus.DONE:
+            raise web.HTTPConflict(reason=f"Job is {job.status}")
+
+        return web.FileResponse(
+            job.result_path(result_format),
+            headers={"Content-Type": RESULT_CONTENT_TYPES[result_format]},
+        )
+
+    async def __delete_job(self, request: web.Request) -> web.Response:
+        job = self.__get_job_or_404(request)
+        if not job.is_finished:
+            raise web.HTTPConflict(reason=f"Job is {job.status}")
+
+        await self.jobs.remove(job)
+        return web.Response(status=web.HTTPNoContent.status_code)
+
+    def __get_job_or_404(self, request: web.Request) -> Job:
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(reason="Job not found")
+        return job
+
+    def __parse_speakers(self, value: object) -> int | None:
+        if value is None or value in {"", "auto"}:
+            return None
+
+        try:
+            n_speakers = int(str(value))
+        except ValueError as e:
+            raise web.HTTPBadRequest(reason="Wrong speakers") from e
+
+        if n_speakers < 1:
+            raise web.HTTPBadRequest(reason="Wrong speakers")
+        return n_speakers
+
+    async def run(self, host: str, port: int) -> None:
+        await self.jobs.resume()
+
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
@@ -0,0 +1,243 @@
+"""Batch jobs running in background."""
+
+import asyncio
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Self
+
+from speech_recognition.output.full_output_pipeline import FullOutputPipeline
+from speech_recognition.pipeline.checkpoints import CheckpointStore, find_jobs
+from speech_recognition.pipeline.interfaces import ProgressObserver
+from speech_recognition.pipeline.services import PipelineServices
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ResultFormat(StrEnum):
+    CSV = "csv"
+    TXT = "txt"
+    SIMPLE_TXT = "simple_txt"
+    JSON = "json"
+
+
+RESULT_FILENAMES = {
+    ResultFormat.CSV: "transcribed.csv",
+    ResultFormat.TXT: "transcribed.txt",
+    ResultFormat.SIMPLE_TXT: "transcribed-simple.txt",
+    ResultFormat.JSON: "transcribed.json",
+}
+
+
+@dataclass
+class Job:
+    """Transcription of one file."""
+
+    id: str
+    filename: str
+    source: Path
+    workdir: Path
+    n_speakers: int | None
+    owns_source: bool
+    status: JobStatus = JobStatus.QUEUED
+    percent: int = 0
+    error: str | None = None
+    finished_at: float | None = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """Job will not change anymore."""
+        return self.status in {JobStatus.DONE, JobStatus.FAILED}
+
+    def result_path(self, result_format: ResultFormat) -> Path:
+        """Return path to result file."""
+        return self.workdir / RESULT_FILENAMES[result_format]
+
+    def to_dict(self) -> dict[str, str | int | None]:
+        """Return public job state."""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "percent": self.percent,
+            "error": self.error,
+        }
+
+    def to_record(self) -> dict[str, Any]:
+        """Return state saved in job directory."""
+        return {
+            "filename": self.filename,
+            "source": str(self.source),
+            "n_speakers": self.n_speakers,
+            "owns_source": self.owns_source,
+            "status": self.status,
+            "error": self.error,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_record(cls, job_id: str, workdir: Path, record: dict[str, Any]) -> Self:
+        """Restore job saved by to_record."""
+        return cls(
+            job_id,
+            record["filename"],
+            Path(record["source"]),
+            workdir,
+            record["n_speakers"],
+            owns_source=record["owns_source"],
+            status=JobStatus(record["status"]),
+            error=record["error"],
+            finished_at=record.get("finished_at"),
+        )
+
+    async def update(self, status: JobStatus | None = None, percent: int | None = None) -> None:
+        """Change state and wake up subscribers."""
+        async with self.changed:
+            if status is not None:
+                self.status = status
+            if percent is not None:
+                self.percent = percent
+            self.changed.notify_all()
+
+
+class JobProgressObserver(ProgressObserver):
+    def __init__(self, job: Job) -> None:
+        """Update progress in job."""
+        self.job = job
+
+    async def update(self, percent: int) -> None:
+        await self.job.update(percent=percent)
+
+
+class JobManager:
+    """Run jobs on shared pipeline services.
+
+    Job state and results of finished pipeline stages are saved in job directory,
+    so jobs are continued by resume after restart.
+    """
+
+    def __init__(
+        self,
+        services: PipelineServices,
+        jobs_dir: Path,
+        max_concurrent_jobs: int,
+        checkpoint_ttl: float = 3 * 24 * 3600,
+    ) -> None:
+        """Init job manager.
+
+        max_concurrent_jobs limits how many jobs are sent to model workers at once.
+        Job directories not changed for checkpoint_ttl seconds are removed by resume, finished jobs
+        are forgotten and their directories removed checkpoint_ttl seconds after finishing.
+        """
+        self._services = services
+        self._jobs_dir = jobs_dir
+        self._checkpoint_ttl = checkpoint_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._jobs: dict[str, Job] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def new_workdir(self) -> tuple[str, Path]:
+        """Create directory for new job."""
+        job_id = uuid.uuid4().hex
+        workdir = self._jobs_dir / job_id
+        await asyncio.to_thread(workdir.mkdir, parents=True)
+        return job_id, workdir
+
+    async def submit(  # noqa: PLR0913
+        self,
+        job_id: str,
+        workdir: Path,
+        source: Path,
+        filename: str,
+        n_speakers: int | None,
+        *,
+        owns_source: bool,
+    ) -> Job:
+        """Add job and start it in background."""
+        self._evict_finished()
+        job = Job(job_id, filename, source, workdir, n_speakers, owns_source=owns_source)
+        await asyncio.to_thread(CheckpointStore(workdir).save_job, job.to_record())
+        self._start(job)
+        return job
+
+    async def resume(self) -> list[Job]:
+        """Restore jobs from jobs directory, unfinished jobs are continued from the last finished stage."""
+        resumed: list[Job] = []
+        for checkpoints in await asyncio.to_thread(find_jobs, self._jobs_dir, self._checkpoint_ttl):
+            record = await asyncio.to_thread(checkpoints.load_job)
+            if record is None or checkpoints.directory.name in self._jobs:
+                continue
+
+            job = Job.from_record(checkpoints.directory.name, checkpoints.directory, record)
+            if job.is_finished:
+                job.finished_at = job.finished_at or time.time()
+                self._jobs[job.id] = job
+            else:
+                job.status = JobStatus.QUEUED
+                self._start(job)
+                resumed.append(job)
+
+        return resumed
+
+    def get(self, job_id: str) -> Job | None:
+        """Return job by id."""
+        return self._jobs.get(job_id)
+
+    async def remove(self, job: Job) -> None:
+        """Forget finished job and remove its files."""
+        del self._jobs[job.id]
+        await asyncio.to_thread(shutil.rmtree, job.workdir, ignore_errors=True)
+
+    def _start(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._track(asyncio.create_task(self._run(job)))
+
+    def _evict_finished(self) -> None:
+        """Forget jobs finished more than checkpoint_ttl seconds ago, their directories are removed in background."""
+        expired = time.time() - self._checkpoint_ttl
+        for job in [job for job in self._jobs.values() if job.finished_at is not None and job.finished_at < expired]:
+            del self._jobs[job.id]
+            self._track(asyncio.create_task(asyncio.to_thread(shutil.rmtree, job.workdir, ignore_errors=True)))
+
+    def _track(self, task: asyncio.Task[None]) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Job) -> None:
+        checkpoints = CheckpointStore(job.workdir)
+        async with self._semaphore:
+            await self._update(job, checkpoints, JobStatus.RUNNING)
+            try:
+                async with FullOutputPipeline(
+                    job.result_path(ResultFormat.CSV),
+                    job.result_path(ResultFormat.TXT),
+                    job.result_path(ResultFormat.SIMPLE_TXT),
+                    job.result_path(ResultFormat.JSON),
+                ) as output:
+                    pipeline = self._services.get_pipeline(output, JobProgressObserver(job))
+                    await pipeline.run_pipeline(job.source, job.n_speakers, checkpoints=checkpoints)
+            except Exception as e:  # noqa: BLE001
+                job.error = repr(e)
+                await self._update(job, checkpoints, JobStatus.FAILED)
+            else:
+                await self._update(job, checkpoints, JobStatus.DONE)
+
+            # cancelled job keeps source and checkpoints and is continued after restart
+            await asyncio.to_thread(checkpoints.clear)
+            if job.owns_source:
+                await asyncio.to_thread(job.source.unlink, missing_ok=True)
+
+    async def _update(self, job: Job, checkpoints: CheckpointStore, status: JobStatus) -> None:
+        if status in {JobStatus.DONE, JobStatus.FAILED}:
+            job.finished_at = time.time()
+        await asyncio.to_thread(checkpoints.save_job, {**job.to_record(), "status": status})
+        await job.update(status=status)
@@ -0,0 +1,72 @@
+"""Load test of telegram bot: simulated users upload recordings at once to the bot with stub models.
+
+Bot runs against local fake Bot API server, so handlers concurrency, FSM, temporary directories and
+queueing in model worker threads are the same as in production, only models are replaced by stubs
+with configured cost. Compare capacity changes with the same --seed:
+
+    uv run src/load_test.py --users 50 --ramp-up 10 --whisper-rtf 0.1 --whisper-workers 2
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+from load_testing.runner import run_load_test
+from load_testing.scenario import generate_scenario
+from load_testing.stub_services import StubCost, create_stub_services
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="Load test telegram bot with fake Bot API server and stub models.")
+    parser.add_argument("--users", type=int, default=50, help="simulated users")
+    parser.add_argument("--uploads-per-user", type=int, default=1, help="recordings sent by every user in turn")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds during which uploads start")
+    parser.add_argument("--voice-share", type=float, default=0.5, help="share of short voice notes")
+    parser.add_argument("--max-duration", type=float, default=1800.0, help="longest recording, seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of scenario generator")
+    parser.add_argument("--timeout", type=float, default=600.0, help="upload without result is failed after it")
+    parser.add_argument("--whisper-workers", type=int, default=1, help="transcription worker threads")
+    parser.add_argument("--whisper-latency", type=float, default=0.2, help="transcription latency, seconds")
+    parser.add_argument("--whisper-rtf", type=float, default=0.05, help="transcription seconds per audio second")
+    parser.add_argument("--diarization-latency", type=float, default=0.1, help="diarization latency, seconds")
+    parser.add_argument("--diarization-rtf", type=float, default=0.01, help="diarization seconds per audio second")
+    parser.add_argument("--preparation-latency", type=float, default=0.05, help="ffmpeg latency, seconds")
+    parser.add_argument("--cpu-share", type=float, default=0.5, help="share of model time spent on CPU")
+    parser.add_argument("--jobs-dir", action="store_true", help="keep jobs in directory with checkpoints")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(message)s")
+
+    uploads = generate_scenario(
+        args.users,
+        ramp_up=args.ramp_up,
+        uploads_per_user=args.uploads_per_user,
+        voice_share=args.voice_share,
+        max_duration=args.max_duration,
+        seed=args.seed,
+    )
+    stubs = create_stub_services(
+        StubCost(args.preparation_latency),
+        StubCost(args.whisper_latency, args.whisper_rtf, args.cpu_share),
+        StubCost(args.diarization_latency, args.diarization_rtf, args.cpu_share),
+        args.whisper_workers,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="hush-load-test-") as jobs_dir:
+        report = asyncio.run(
+            run_load_test(
+                uploads,
+                stubs,
+                upload_timeout=args.timeout,
+                jobs_dir=Path(jobs_dir) if args.jobs_dir else None,
+            ),
+        )
+    stubs.stop()
+
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Load testing of telegram bot with fake Bot API server and stub models."""
@@ -0,0 +1,239 @@
+"""Local Bot API server speaking the same HTTP protocol as api.telegram.org."""
+
+import asyncio
+import contextlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import BodyPartReader, web
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+BOT_USER_ID = 1
+
+
+@dataclass(frozen=True)
+class BotCall:
+    """Request of the bot to Bot API addressed to one chat."""
+
+    method: str
+    chat_id: int
+    fields: dict[str, str]
+    received: float = field(default_factory=time.monotonic)
+    message_id: int | None = None
+    uploaded_bytes: int = 0
+
+    @property
+    def text(self) -> str:
+        """Message text, empty for documents."""
+        return self.fields.get("text", "")
+
+    @property
+    def reply_to(self) -> int | None:
+        """Id of message this message replies to."""
+        if "reply_parameters" in self.fields:
+            return int(json.loads(self.fields["reply_parameters"])["message_id"])
+        if "reply_to_message_id" in self.fields:
+            return int(self.fields["reply_to_message_id"])
+        return None
+
+    @property
+    def has_keyboard(self) -> bool:
+        """Message has reply keyboard."""
+        return "keyboard" in json.loads(self.fields.get("reply_markup", "{}"))
+
+
+class FakeBotApiServer:
+    """Bot API server for one bot: users are simulated by adding updates, bot requests are recorded per chat.
+
+    getUpdates is long polling like the real server. Files added by add_file are returned by getFile and
+    downloaded over HTTP. Methods which are not implemented return True.
+    """
+
+    def __init__(self, token: str) -> None:  # noqa: D107
+        self.token = token
+        self.base_url = ""
+        self.requests: dict[str, int] = {}
+
+        self._updates: list[dict[str, Any]] = []
+        self._has_updates = asyncio.Event()
+        self._polled = asyncio.Event()
+        self._closing = False
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._files: dict[str, bytes] = {}
+        self._chats: dict[int, asyncio.Queue[BotCall]] = {}
+        self._blocked_chats: set[int] = set()
+
+        self._methods: dict[str, Callable[[dict[str, str], int], dict[str, Any] | bool | None]] = {
+            "getMe": self._get_me,
+            "getFile": self._get_file,
+            "sendMessage": self._send_message,
+            "sendDocument": self._send_message,
+            "editMessageText": self._edit_message,
+        }
+        self._app = web.Application()
+        self._app.router.add_post(f"/bot{token}/getUpdates", self._get_updates)
+        self._app.router.add_post(f"/bot{token}/{{method}}", self._call)
+        self._app.router.add_get(f"/file/bot{token}/{{path:.+}}", self._download)
+        self._runner = web.AppRunner(self._app)
+
+    async def start(self) -> None:
+        """Listen on random local port, base_url is set after start."""
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    async def wait_polling(self) -> None:
+        """Wait until bot starts polling updates."""
+        await self._polled.wait()
+
+    def release_polling(self) -> None:
+        """Answer pending and next getUpdates at once without updates, so the bot can stop polling quickly."""
+        self._closing = True
+        self._has_updates.set()
+
+    def block_chat(self, chat_id: int) -> None:
+        """Answer requests to chat with 403 like for user who blocked the bot."""
+        self._blocked_chats.add(chat_id)
+
+    def add_file(self, file_id: str, content: bytes) -> None:
+        """Make file available for getFile and downloading."""
+        self._files[file_id] = content
+
+    def send_message(self, user_id: int, message: dict[str, Any]) -> int:
+        """Send message from user to the bot in private chat, return message id."""
+        message_id = self._new_message_id()
+        user = {"id": user_id, "is_bot": False, "first_name": f"User {user_id}"}
+        self._updates.append(
+            {
+                "update_id": self._next_update_id,
+                "message": {
+                    "message_id": message_id,
+                    "date": int(time.time()),
+                    "chat": {"id": user_id, "type": "private"},
+                    "from": user,
+                    **message,
+                },
+            },
+        )
+        self._next_update_id += 1
+        self._has_updates.set()
+        return message_id
+
+    async def next_call(self, chat_id: int) -> BotCall:
+        """Wait for next request of the bot to chat."""
+        return await self._chat(chat_id).get()
+
+    def _chat(self, chat_id: int) -> asyncio.Queue[BotCall]:
+        return self._chats.setdefault(chat_id, asyncio.Queue())
+
+    def _new_message_id(self) -> int:
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        return message_id
+
+    async def _get_updates(self, request: web.Request) -> web.Response:
+        fields, _ = await self._read_fields(request)
+        self._count("getUpdates")
+        self._polled.set()
+
+        offset = int(fields.get("offset", 0))
+        self._updates = [update for update in self._updates if update["update_id"] >= offset]
+        if not self._updates and not self._closing:
+            self._has_updates.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._has_updates.wait(), float(fields.get("timeout", 0)))
+
+        limit = int(fields.get("limit", 100))
+        return web.json_response({"ok": True, "result": self._updates[:limit]})
+
+    async def _call(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        fields, uploaded_bytes = await self._read_fields(request)
+        self._count(method)
+
+        if "chat_id" in fields and int(fields["chat_id"]) in self._blocked_chats:
+            description = "Forbidden: bot was blocked by the user"
+            return web.json_response({"ok": False, "error_code": 403, "description": description}, status=403)
+
+        handler = self._methods.get(method)
+        result = handler(fields, uploaded_bytes) if handler is not None else True
+        if result is None:
+            return web.json_response({"ok": False, "error_code": 400, "description": "Bad Request"}, status=400)
+        return web.json_response({"ok": True, "result": result})
+
+    async def _download(self, request: web.Request) -> web.Response:
+        self._count("download")
+        content = self._files.get(request.match_info["path"])
+        if content is None:
+            raise web.HTTPNotFound
+        return web.Response(body=content)
+
+    def _get_me(self, _fields: dict[str, str], _uploaded_bytes: int) -> dict[str, Any]:
+        return {"id": BOT_USER_ID, "is_bot": True, "first_name": "Hush", "username": "hush_load_test_bot"}
+
+    def _get_file(self, fields: dict[str, str], _uploaded_bytes: int) -> dict[str, Any] | None:
+        file_id = fields["file_id"]
+        if file_id not in self._files:
+            return None
+        return {
+            "file_id": file_id,
+            "file_unique_id": file_id,
+            "file_size": len(self._files[file_id]),
+            "file_path": file_id,
+        }
+
+    def _send_message(self, fields: dict[str, str], uploaded_bytes: int) -> dict[str, Any]:
+        chat_id = int(fields["chat_id"])
+        message_id = self._new_message_id()
+        method = "sendDocument" if uploaded_bytes or "document" in fields else "sendMessage"
+        self._chat(chat_id).put_nowait(
+            BotCall(method, chat_id, fields, message_id=message_id, uploaded_bytes=uploaded_bytes),
+        )
+
+        message: dict[str, Any] = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": self._get_me(fields, uploaded_bytes),
+        }
+        if method == "sendDocument":
+            message["document"] = {"file_id": f"document-{message_id}", "file_unique_id": f"document-{message_id}"}
+        else:
+            message["text"] = fields.get("text", "")
+        return message
+
+    def _edit_message(self, fields: dict[str, str], uploaded_bytes: int) -> bool:
+        chat_id = int(fields["chat_id"])
+        self._chat(chat_id).put_nowait(BotCall("editMessageText", chat_id, fields, uploaded_bytes=uploaded_bytes))
+        return True
+
+    async def _read_fields(self, request: web.Request) -> tuple[dict[str, str], int]:
+        """Return text fields of form and size of uploaded files, files are not kept."""
+        if not request.content_type.startswith("multipart/"):
+            return {key: str(value) for key, value in (await request.post()).items()}, 0
+
+        fields: dict[str, str] = {}
+        uploaded_bytes = 0
+        reader = await request.multipart()
+        while (part := await reader.next()) is not None:
+            if not isinstance(part, BodyPartReader) or part.name is None:
+                continue
+            if part.filename is None:
+                fields[part.name] = await part.text()
+            else:
+                while chunk := await part.read_chunk():
+                    uploaded_bytes += len(chunk)
+        return fields, uploaded_bytes
+
+    def _count(self, method: str) -> None:
+        self.requests[method] = self.requests.get(method, 0) + 1
@@ -0,0 +1,68 @@
+"""Latency, queueing and memory statistics of load test."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .scenario import UploadResult
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentiles(values: Sequence[float]) -> tuple[float, ...]:
+    """Return p50, p95 and p99, NaN without values."""
+    if not values:
+        return tuple(float("nan") for _ in PERCENTILES)
+    return tuple(float(value) for value in np.percentile(values, PERCENTILES))
+
+
+@dataclass
+class LoadReport:
+    """Results of all uploads, queue waits of stub model workers and memory of the process."""
+
+    results: list[UploadResult]
+    queue_waits: dict[str, list[float]] = field(default_factory=dict[str, list[float]])
+    wall_seconds: float = 0.0
+    peak_inflight: int = 0
+    baseline_rss_bytes: int = 0
+    peak_rss_bytes: int = 0
+    requests: dict[str, int] = field(default_factory=dict[str, int])
+
+    @property
+    def failed(self) -> list[UploadResult]:
+        """Uploads without transcript."""
+        return [result for result in self.results if result.latency is None]
+
+    def latencies(self, *kinds: str) -> list[float]:
+        """Latencies of finished uploads of kinds, all kinds if not set."""
+        return [
+            result.latency
+            for result in self.results
+            if result.latency is not None and (not kinds or result.upload.kind in kinds)
+        ]
+
+    def __str__(self) -> str:  # noqa: D105
+        rows = [
+            ("job latency, all", self.latencies()),
+            ("job latency, voice", self.latencies("voice")),
+            ("job latency, files", self.latencies("audio", "document")),
+            *((f"queue wait, {name}", waits) for name, waits in self.queue_waits.items()),
+        ]
+        lines = [
+            (
+                f"uploads: {len(self.results)}, failed: {len(self.failed)}, peak in flight: {self.peak_inflight}, "
+                f"wall: {self.wall_seconds:.1f} s"
+            ),
+            (
+                f"peak rss: {self.peak_rss_bytes / 2**20:.0f} MiB "
+                f"(+{(self.peak_rss_bytes - self.baseline_rss_bytes) / 2**20:.0f} MiB during test)"
+            ),
+            f"{'seconds':<24} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}",
+        ]
+        lines.extend(
+            f"{name:<24} {len(values):>6} " + " ".join(f"{value:>8.2f}" for value in percentiles(values))
+            for name, values in rows
+        )
+        lines.extend(f"failed: user {result.upload.user_id}: {result.error}" for result in self.failed)
+        return "\n".join(lines)
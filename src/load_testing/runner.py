@@ -0,0 +1,89 @@
+"""Running telegram bot against fake Bot API server with simulated users."""
+
+import asyncio
+import itertools
+import resource
+import time
+from operator import attrgetter
+from pathlib import Path
+
+from aiogram.client.telegram import TelegramAPIServer
+
+from telegram_integration.telegram_integration import TelegramBotApp
+
+from .fake_bot_api import FakeBotApiServer
+from .report import LoadReport
+from .scenario import SimulatedUser, Upload, UploadResult
+from .stub_services import StubServices
+
+TOKEN = "42:LOAD-TEST"  # noqa: S105
+
+
+async def run_load_test(
+    uploads: list[Upload],
+    stubs: StubServices,
+    *,
+    upload_timeout: float = 600.0,
+    jobs_dir: Path | None = None,
+    blocked_chats: tuple[int, ...] = (),
+) -> LoadReport:
+    """Run the bot with stub services until all uploads are done or upload_timeout is over for them.
+
+    Bot works the same way as in production: polling, handlers run as concurrent tasks, FSM in memory,
+    files are downloaded to temporary (or jobs_dir) directories. Users of blocked_chats have blocked the bot.
+    """
+    server = FakeBotApiServer(TOKEN)
+    await server.start()
+    for chat_id in blocked_chats:
+        server.block_chat(chat_id)
+    app = TelegramBotApp(TOKEN, stubs.services, TelegramAPIServer.from_base(server.base_url), jobs_dir=jobs_dir)
+    polling = asyncio.create_task(app.run())
+
+    try:
+        # bot failing on start must fail the test instead of waiting for polling forever
+        started_polling = asyncio.create_task(server.wait_polling())
+        await asyncio.wait([started_polling, polling], return_when=asyncio.FIRST_COMPLETED)
+        if polling.done():
+            started_polling.cancel()
+            polling.result()
+        baseline_rss = _peak_rss_bytes()
+        started = time.monotonic()
+
+        by_user = itertools.groupby(sorted(uploads, key=attrgetter("user_id")), key=attrgetter("user_id"))
+        users = [
+            SimulatedUser(server, user_id, upload_timeout).run(list(user_uploads), started)
+            for user_id, user_uploads in by_user
+        ]
+        results = [result for user_results in await asyncio.gather(*users) for result in user_results]
+
+        return LoadReport(
+            sorted(results, key=attrgetter("sent")),
+            {
+                "transcription": list(stubs.transcription.queue_waits),
+                "diarization": list(stubs.diarization.queue_waits),
+            },
+            time.monotonic() - started,
+            _peak_inflight(results),
+            baseline_rss,
+            _peak_rss_bytes(),
+            dict(server.requests),
+        )
+    finally:
+        server.release_polling()
+        if not polling.done():
+            await app.dp.stop_polling()
+        try:
+            await polling
+        finally:
+            await server.stop()
+
+
+def _peak_inflight(results: list[UploadResult]) -> int:
+    """Return maximal number of uploads sent and not finished at the same time."""
+    events = sorted([(result.sent, 1) for result in results] + [(result.finished, -1) for result in results])
+    return max(itertools.accumulate(change for _, change in events), default=0)
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident memory of the process, ru_maxrss is in kilobytes on Linux."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
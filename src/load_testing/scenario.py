@@ -0,0 +1,129 @@
+"""Concurrent uploads and users sending them to the bot."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .fake_bot_api import FakeBotApiServer
+from .stub_services import make_recording
+
+UploadKind = Literal["voice", "audio", "document"]
+
+# messages of the bot saying that job can not be done
+ERROR_PREFIXES = ("Ой", "Файл слишком большой")
+RESULT_DOCUMENTS = 3
+
+
+@dataclass(frozen=True)
+class Upload:
+    """Recording sent by user at start seconds after beginning of scenario."""
+
+    user_id: int
+    start: float
+    kind: UploadKind
+    duration: float
+    speakers: int | None = None
+
+
+@dataclass(frozen=True)
+class UploadResult:
+    """Upload sent and finished (got the last result or error) at seconds after beginning of scenario."""
+
+    upload: Upload
+    sent: float
+    finished: float
+    error: str | None = None
+
+    @property
+    def latency(self) -> float | None:
+        """Time from sending recording to getting the last result, None if job failed."""
+        return None if self.error else self.finished - self.sent
+
+
+def generate_scenario(  # noqa: PLR0913
+    users: int,
+    *,
+    ramp_up: float = 0.0,
+    uploads_per_user: int = 1,
+    voice_share: float = 0.5,
+    max_duration: float = 1800.0,
+    seed: int = 0,
+) -> list[Upload]:
+    """Return uploads of users sorted by start.
+
+    Uploads start uniformly during ramp_up seconds (at once with 0). voice_share of them are voice notes
+    up to a minute, the others are audio and documents from a minute to max_duration with unknown or
+    2-4 speakers. Uploads of one user go one after another.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    uploads: list[Upload] = []
+    for user_id in range(1, users + 1):
+        for _ in range(uploads_per_user):
+            start = rng.uniform(0, ramp_up)
+            if rng.random() < voice_share:
+                uploads.append(Upload(user_id, start, "voice", rng.uniform(2, 60)))
+            else:
+                kind: UploadKind = rng.choice(["audio", "document"])
+                speakers = rng.choice([None, 2, 3, 4])
+                uploads.append(Upload(user_id, start, kind, rng.uniform(60, max_duration), speakers))
+    return sorted(uploads, key=lambda upload: upload.start)
+
+
+class SimulatedUser:
+    """Telegram user sending uploads one by one and answering bot questions."""
+
+    def __init__(self, server: FakeBotApiServer, user_id: int, timeout: float) -> None:  # noqa: D107
+        self._server = server
+        self._user_id = user_id
+        self._timeout = timeout
+        self._uploads = 0
+
+    async def run(self, uploads: list[Upload], started: float) -> list[UploadResult]:
+        """Send uploads at their start times (monotonic started + upload.start), one after another."""
+        results: list[UploadResult] = []
+        for upload in uploads:
+            await asyncio.sleep(max(0.0, started + upload.start - time.monotonic()))
+            results.append(await self.send(upload, started))
+        return results
+
+    async def send(self, upload: Upload, started: float) -> UploadResult:
+        """Send recording and wait for transcript."""
+        sent = time.monotonic() - started
+        try:
+            async with asyncio.timeout(self._timeout):
+                error = await self._talk(upload)
+        except TimeoutError:
+            error = f"no result in {self._timeout:.0f} s"
+        return UploadResult(upload, sent, time.monotonic() - started, error)
+
+    async def _talk(self, upload: Upload) -> str | None:
+        """Return error of the bot, None if transcript is received."""
+        self._uploads += 1
+        file_id = f"{self._user_id}-{self._uploads}"
+        content = make_recording(upload.duration)
+        self._server.add_file(file_id, content)
+        message_id = self._server.send_message(self._user_id, self._media(upload, file_id, len(content)))
+
+        documents = 0
+        while True:
+            call = await self._server.next_call(self._user_id)
+            if call.method == "sendDocument":
+                documents += 1
+                if documents == RESULT_DOCUMENTS or call.reply_to == message_id:
+                    return None
+            elif call.method == "sendMessage":
+                if call.text.startswith(ERROR_PREFIXES):
+                    return call.text
+                if call.reply_to == message_id:
+                    return None
+                if call.has_keyboard:
+                    answer = "Авто" if upload.speakers is None else str(upload.speakers)
+                    self._server.send_message(self._user_id, {"text": answer})
+
+    def _media(self, upload: Upload, file_id: str, file_size: int) -> dict[str, Any]:
+        media: dict[str, Any] = {"file_id": file_id, "file_unique_id": file_id, "file_size": file_size}
+        if upload.kind == "document":
+            return {"document": {**media, "file_name": f"{file_id}.ogg"}}
+        return {upload.kind: {**media, "duration": round(upload.duration)}}
@@ -0,0 +1,200 @@
+"""Pipeline services imitating model workers without loading models.
+
+Recordings are generated by make_recording: json header with duration and padding up to realistic size.
+Stub models run in worker threads fed by queues like the real services, so jobs wait for them the same way.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import numpy as np
+from aiofiles.threadpool.binary import AsyncBufferedReader
+
+from speech_recognition.futures import set_future_exception, set_future_result
+from speech_recognition.pipeline.services import PipelineServices
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+
+# ogg opus voice notes are about 2 KB per second
+RECORDING_BYTES_PER_SECOND = 2 * 1024
+SEGMENT_LENGTH = 5.0
+
+
+def make_recording(duration: float) -> bytes:
+    """Return content of fake recording, its size is proportional to duration."""
+    header = json.dumps({"duration": duration}).encode() + b"\n"
+    return header + b"\0" * max(0, int(duration * RECORDING_BYTES_PER_SECOND) - len(header))
+
+
+def recording_duration(content: bytes) -> float:
+    """Return duration of fake recording."""
+    return float(json.loads(content.split(b"\n", 1)[0])["duration"])
+
+
+@dataclass(frozen=True)
+class StubCost:
+    """Time of processing a recording: latency + duration * real_time_factor seconds.
+
+    cpu_share of this time worker keeps CPU busy (GIL is released, like in model libraries), the rest it sleeps.
+    """
+
+    latency: float = 0.0
+    real_time_factor: float = 0.0
+    cpu_share: float = 0.0
+
+    def seconds(self, duration: float) -> float:
+        return self.latency + duration * self.real_time_factor
+
+
+class StubModelWorker:
+    """Worker threads taking recordings from one queue, time spent by jobs in the queue is recorded."""
+
+    def __init__(self, cost: StubCost, workers: int = 1) -> None:  # noqa: D107
+        self.cost = cost
+        self.queue_waits: list[float] = []
+        self._matrix = np.ones((128, 128), dtype=np.float32)
+        self._task_queue: queue.Queue[tuple[asyncio.Future[None], float, float] | None] = queue.Queue()
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    async def process(self, duration: float) -> None:
+        """Wait until recording of duration seconds is processed."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._task_queue.put((future, duration, time.monotonic()))
+        await future
+
+    def stop(self) -> None:
+        """Stop worker threads after queued recordings."""
+        for _ in self._threads:
+            self._task_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _worker(self) -> None:
+        while (task := self._task_queue.get()) is not None:
+            future, duration, enqueued = task
+            self.queue_waits.append(time.monotonic() - enqueued)
+            try:
+                self._work(self.cost.seconds(duration))
+                set_future_result(future, None)
+            except Exception as exc:  # noqa: BLE001
+                set_future_exception(future, exc)
+
+    def _work(self, seconds: float) -> None:
+        busy_until = time.monotonic() + seconds * self.cost.cpu_share
+        while time.monotonic() < busy_until:
+            self._matrix @ self._matrix  # pyright: ignore[reportUnusedExpression]
+        time.sleep(seconds * (1 - self.cost.cpu_share))
+
+
+class StubPreparationService:
+    """Returns recording as is after latency of conversion."""
+
+    def __init__(self, cost: StubCost) -> None:  # noqa: D107
+        self.cost = cost
+
+    @asynccontextmanager
+    async def get_prepared_file(
+        self,
+        filename: Path,
+        *,
+        denoise: bool = True,  # noqa: ARG002
+    ) -> AsyncGenerator[AsyncBufferedReader, None]:
+        """Return file as is."""
+        async with aiofiles.open(filename, "rb") as file:
+            await asyncio.sleep(self.cost.seconds(recording_duration(await file.readline())))
+            await file.seek(0)
+            yield file
+
+    async def get_duration(self, filename: Path) -> float:
+        """Return duration from recording header."""
+        async with aiofiles.open(filename, "rb") as file:
+            return recording_duration(await file.readline())
+
+
+class StubTranscriptionService:
+    """Returns one word for every second of recording."""
+
+    def __init__(self, worker: StubModelWorker) -> None:  # noqa: D107
+        self.worker = worker
+
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,
+        checkpoint: TranscriptionCheckpoint | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Return words after recording is processed by worker."""
+        duration = recording_duration(await file.read())
+        await self.worker.process(duration)
+
+        starts = np.arange(int(duration), dtype=np.float64)
+        return ColumnarTranscript.from_rows(starts.tolist(), (starts + 0.8).tolist(), [" слово"] * len(starts))
+
+
+class StubDiarizationService:
+    """Returns segments of SEGMENT_LENGTH seconds, speakers take turns."""
+
+    def __init__(self, worker: StubModelWorker) -> None:  # noqa: D107
+        self.worker = worker
+
+    async def get_segments_from_file(
+        self,
+        file: AsyncBufferedReader,
+        n_speakers: int | None = None,
+    ) -> ColumnarTranscript:
+        """Return segments after recording is processed by worker."""
+        duration = recording_duration(await file.read())
+        await self.worker.process(duration)
+
+        speakers = n_speakers or 2
+        starts = np.arange(0.0, duration, SEGMENT_LENGTH)
+        labels = np.arange(len(starts), dtype=np.int32) % speakers
+        return ColumnarTranscript.from_rows(
+            starts.tolist(),
+            np.minimum(starts + SEGMENT_LENGTH, duration).tolist(),
+            [""] * len(starts),
+            labels.tolist(),
+            tuple(f"SPEAKER_{speaker}" for speaker in range(speakers)),
+        )
+
+
+@dataclass(frozen=True)
+class StubServices:
+    """Stub pipeline services and their model workers."""
+
+    services: PipelineServices
+    transcription: StubModelWorker
+    diarization: StubModelWorker
+
+    def stop(self) -> None:
+        self.transcription.stop()
+        self.diarization.stop()
+
+
+def create_stub_services(
+    preparation: StubCost,
+    transcription: StubCost,
+    diarization: StubCost,
+    whisper_workers: int = 1,
+) -> StubServices:
+    """Create stubs, transcription has whisper_workers worker threads and diarization has one."""
+    transcription_worker = StubModelWorker(transcription, whisper_workers)
+    diarization_worker = StubModelWorker(diarization)
+    return StubServices(
+        PipelineServices(
+            StubPreparationService(preparation),
+            StubDiarizationService(diarization_worker),
+            StubTranscriptionService(transcription_worker),
+        ),
+        transcription_worker,
+        diarization_worker,
+    )
@@ -1,18 +1,30 @@
 import asyncio
+from typing import TYPE_CHECKING, Any
 
+from app_factory import create_http_app, create_services, create_telegram_app
 from settings.settings import Settings
-from telegram_integration.telegram_integration import TelegramBotApp
 
-settings = Settings()
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
 
 
 async def main() -> None:  # noqa: D103
-    if settings.telegram_api_key is None:
-        msg = "TELEGRAM API KEY NEEDED"
+    settings = Settings()
+    if settings.telegram_api_key is None and settings.http_api_port is None:
+        msg = "TELEGRAM API KEY OR HTTP API PORT NEEDED"
         raise RuntimeError(msg)
 
-    app = TelegramBotApp(settings.telegram_api_key)
-    await app.run()
+    services = create_services(settings)
+    apps: list[Coroutine[Any, Any, None]] = []
 
+    if settings.telegram_api_key is not None:
+        apps.append(create_telegram_app(settings, services).run())
 
-asyncio.run(main())
+    if settings.http_api_port is not None:
+        apps.append(create_http_app(settings, services).run(settings.http_api_host, settings.http_api_port))
+
+    await asyncio.gather(*apps)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -5,7 +8,61 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     telegram_api_key: str | None = Field(default=None, alias="TELEGRAM_API_KEY")
 
+    # Self-hosted Bot API server (https://github.com/tdlib/telegram-bot-api)
+    telegram_api_base_url: str | None = Field(default=None, alias="TELEGRAM_API_BASE_URL")
+    telegram_api_local_mode: bool = Field(default=False, alias="TELEGRAM_API_LOCAL_MODE")
+    # Bot API server working dir and the path where it is mounted in this container (if they differ)
+    telegram_api_server_files_dir: Path | None = Field(default=None, alias="TELEGRAM_API_SERVER_FILES_DIR")
+    telegram_api_local_files_dir: Path | None = Field(default=None, alias="TELEGRAM_API_LOCAL_FILES_DIR")
+
+    # Working directories of bot jobs, unfinished jobs are continued after restart; temporary directories if not set
+    telegram_jobs_dir: Path | None = Field(default=None, alias="TELEGRAM_JOBS_DIR")
+
+    # HTTP batch API, disabled without port
+    http_api_host: str = Field(default="127.0.0.1", alias="HTTP_API_HOST")
+    http_api_port: int | None = Field(default=None, alias="HTTP_API_PORT")
+    http_api_jobs_dir: Path | None = Field(default=None, alias="HTTP_API_JOBS_DIR")
+    http_api_local_files_dir: Path | None = Field(default=None, alias="HTTP_API_LOCAL_FILES_DIR")
+    http_api_max_concurrent_jobs: int = Field(default=4, alias="HTTP_API_MAX_CONCURRENT_JOBS")
+
+    # Job directories with checkpoints of unfinished stages and results are removed after this time
+    checkpoint_ttl_hours: float = Field(default=72, alias="CHECKPOINT_TTL_HOURS")
+
+    whisper_device: str = Field(default="auto", alias="WHISPER_DEVICE")
+    # Short (< 30 s) transcription jobs arriving together are transcribed in one batch
+    whisper_batch_size: int = Field(default=8, alias="WHISPER_BATCH_SIZE")
+    whisper_batch_max_wait_ms: int = Field(default=200, alias="WHISPER_BATCH_MAX_WAIT_MS")
+    # Language of recordings, detected for every job if not set
+    whisper_language: str | None = Field(default=None, alias="WHISPER_LANGUAGE")
+
+    # CPU cores of the process split between whisper workers, speaker embeddings and vad, all cores if not set
+    cpu_threads: int | None = Field(default=None, alias="CPU_THREADS")
+    # Parallel whisper model replicas and threads of each one, by default remaining cores are split between them
+    whisper_workers: int = Field(default=1, alias="WHISPER_WORKERS")
+    whisper_cpu_threads: int | None = Field(default=None, alias="WHISPER_CPU_THREADS")
+    # Speaker embeddings threads, quarter of cores by default
+    diarization_cpu_threads: int | None = Field(default=None, alias="DIARIZATION_CPU_THREADS")
+    # Speaker embeddings engine: "torch" (resemblyzer) or "onnx" (exported by src/export_speaker_encoder.py)
+    diarization_embeddings_engine: Literal["torch", "onnx"] = Field(
+        default="torch",
+        alias="DIARIZATION_EMBEDDINGS_ENGINE",
+    )
+    diarization_onnx_encoder_path: Path = Field(
+        default=Path("./models/voice_encoder.onnx"),
+        alias="DIARIZATION_ONNX_ENCODER_PATH",
+    )
+    # Enrolled speakers (src/enroll_speaker.py), matched clusters are labeled with names; disabled if not set
+    speaker_registry_dir: Path | None = Field(default=None, alias="SPEAKER_REGISTRY_DIR")
+    # Memory-map centroids instead of reading them, for registries with many speakers
+    speaker_registry_mmap: bool = Field(default=False, alias="SPEAKER_REGISTRY_MMAP")
+    # Minimal cosine similarity of cluster centroid and enrolled speaker
+    speaker_match_threshold: float = Field(default=0.8, alias="SPEAKER_MATCH_THRESHOLD")
+
+    # Short voice and video notes are transcribed as one speaker without speakers question
+    voice_fast_path_max_duration: int = Field(default=60, alias="VOICE_FAST_PATH_MAX_DURATION")
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
+        "env_ignore_empty": True,
     }
@@ -1,27 +1,30 @@
 """Contains interfaces for diarization module."""
 
-from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from collections.abc import Sequence
 from typing import Protocol
 
+import numpy as np
+import numpy.typing as npt
 from aiofiles.threadpool.binary import AsyncBufferedReader
 
-
-@dataclass(frozen=True)
-class SpeakerSegment:
-    """Segment where speaker say."""
-
-    time: tuple[float, float]
-    key: str
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
 
 
 class DiarizationService(Protocol):
     """Interface for diarization strategy."""
 
-    def get_segments_from_file(
+    async def get_segments_from_file(
         self,
         file: AsyncBufferedReader,
         n_speakers: int | None = None,
-    ) -> AsyncIterator[SpeakerSegment]:
-        """Return iterator with segments where speaker say in audio file."""
+    ) -> ColumnarTranscript:
+        """Return segments where speaker say in audio file, rows have no text."""
+        ...
+
+
+class SpeakerEncoder(Protocol):
+    """Model computing speaker embeddings."""
+
+    def embed_utterances(self, wavs: Sequence[npt.NDArray[np.float32]]) -> npt.NDArray[np.float32]:
+        """Return L2-normed embedding of every 16 kHz utterance, shape (len(wavs), embedding size)."""
         ...
@@ -0,0 +1,151 @@
+"""Resemblyzer voice encoder running on ONNX Runtime with NumPy mel frontend."""
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import numpy.typing as npt
+
+# resemblyzer hparams
+SAMPLE_RATE = 16000
+N_FFT = 400  # 25 ms window
+HOP_LENGTH = 160  # 10 ms step
+N_MELS = 40
+PARTIAL_FRAMES = 160  # 1.6 s
+EMBEDDING_SIZE = 256
+
+
+def mel_filters(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> npt.NDArray[np.float32]:
+    """Slaney mel filterbank of shape (n_mels, 1 + n_fft // 2), the same as librosa.filters.mel."""
+    fft_freqs = np.fft.rfftfreq(n_fft, 1 / sample_rate)
+    mel_freqs = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sample_rate / 2), n_mels + 2))
+
+    ramps = mel_freqs[:, None] - fft_freqs[None, :]
+    widths = np.diff(mel_freqs)
+    lower = -ramps[:-2] / widths[:-1, None]
+    upper = ramps[2:] / widths[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+
+    # slaney normalization, every filter has the same area
+    weights *= (2.0 / (mel_freqs[2:] - mel_freqs[:-2]))[:, None]
+    return weights.astype(np.float32)
+
+
+def mel_spectrogram(wav: npt.NDArray[np.float32], filters: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    """Power mel spectrogram of shape (frames, n_mels), the same as resemblyzer wav_to_mel_spectrogram."""
+    # centered frames, signal is padded with zeros by half of window
+    padded = np.pad(wav.astype(np.float32), N_FFT // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT)[::HOP_LENGTH]
+    window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)  # periodic hann
+
+    spectrum = np.fft.rfft(frames * window, axis=1)
+    power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+    return power @ filters.T
+
+
+def partial_slices(n_samples: int, rate: float = 1.3, min_coverage: float = 0.75) -> list[int]:
+    """Return first mel frames of partial utterances, the same as VoiceEncoder.compute_partial_slices."""
+    n_frames = int(np.ceil((n_samples + 1) / HOP_LENGTH))
+    frame_step = round((SAMPLE_RATE / rate) / HOP_LENGTH)
+
+    steps = max(1, n_frames - PARTIAL_FRAMES + frame_step + 1)
+    starts = list(range(0, steps, frame_step))
+
+    # last partial is dropped if audio covers less than min_coverage of it
+    coverage = (n_samples - starts[-1] * HOP_LENGTH) / (PARTIAL_FRAMES * HOP_LENGTH)
+    if coverage < min_coverage and len(starts) > 1:
+        starts.pop()
+    return starts
+
+
+class OnnxSpeakerEncoder:
+    """Voice encoder exported by export_voice_encoder.
+
+    Partial utterances of all passed segments are embedded by one session run (in chunks of batch_size).
+    """
+
+    def __init__(self, model_path: Path, threads: int = 0, batch_size: int = 64) -> None:
+        """Load model.
+
+        Session runs with threads intra-op threads (0 - onnxruntime default) and one inter-op thread,
+        like silero vad session.
+        """
+        import onnxruntime  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+
+        options = onnxruntime.SessionOptions()  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+
+        self._session: onnxruntime.InferenceSession = onnxruntime.InferenceSession(
+            str(model_path),
+            sess_options=options,  # pyright: ignore[reportUnknownArgumentType]
+            providers=["CPUExecutionProvider"],
+        )
+        self._batch_size = batch_size
+        self._filters = mel_filters()
+
+    def embed_utterances(self, wavs: Sequence[npt.NDArray[np.float32]]) -> npt.NDArray[np.float32]:
+        """Return L2-normed embedding of every utterance, shape (len(wavs), 256)."""
+        partials: list[npt.NDArray[np.float32]] = []
+        counts: list[int] = []
+        for wav in wavs:
+            starts = partial_slices(len(wav))
+            required = (starts[-1] + PARTIAL_FRAMES) * HOP_LENGTH
+            mel = mel_spectrogram(np.pad(wav, (0, max(0, required - len(wav)))), self._filters)
+
+            partials.extend(mel[start : start + PARTIAL_FRAMES] for start in starts)
+            counts.append(len(starts))
+
+        if not partials:
+            return np.zeros((0, EMBEDDING_SIZE), dtype=np.float32)
+
+        mels = np.stack(partials)
+        embeddings = np.concatenate(
+            [
+                # the only output of the model is dense embeddings array
+                cast(
+                    "npt.NDArray[np.float32]",
+                    self._session.run(None, {"mels": mels[first : first + self._batch_size]})[0],  # pyright: ignore[reportUnknownMemberType]
+                )
+                for first in range(0, len(mels), self._batch_size)
+            ],
+        )
+
+        # utterance embedding is normalized mean of its partial embeddings
+        sums = np.add.reduceat(embeddings, np.cumsum([0, *counts[:-1]]), axis=0)
+        return (sums / np.linalg.norm(sums, axis=1, keepdims=True)).astype(np.float32)
+
+
+def export_voice_encoder(model_path: Path) -> None:
+    """Export pretrained resemblyzer VoiceEncoder to ONNX, requires torch and resemblyzer."""
+    import torch  # noqa: PLC0415
+    from resemblyzer import VoiceEncoder  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+
+    encoder = VoiceEncoder("cpu", verbose=False)
+    encoder.eval()
+    torch.onnx.export(  # pyright: ignore[reportUnknownMemberType]
+        encoder,
+        (torch.zeros(1, PARTIAL_FRAMES, N_MELS),),
+        str(model_path),
+        input_names=["mels"],
+        output_names=["embeddings"],
+        dynamic_axes={"mels": {0: "batch"}, "embeddings": {0: "batch"}},
+        opset_version=17,
+        dynamo=False,
+    )
+
+
+def _hz_to_mel(frequencies: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    mels = frequencies / (200.0 / 3)
+    # logarithmic above 1 kHz
+    log_region = frequencies >= 1000.0  # noqa: PLR2004
+    return np.where(log_region, 15.0 + np.log(np.maximum(frequencies, 1000.0) / 1000.0) / (np.log(6.4) / 27.0), mels)
+
+
+def _mel_to_hz(mels: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    mels = np.asarray(mels, dtype=np.float64)
+    frequencies = mels * (200.0 / 3)
+    log_region = mels >= 15.0  # noqa: PLR2004
+    return np.where(log_region, 1000.0 * np.exp((np.log(6.4) / 27.0) * (np.maximum(mels, 15.0) - 15.0)), frequencies)
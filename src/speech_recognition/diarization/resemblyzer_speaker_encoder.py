@@ -0,0 +1,24 @@
+"""Resemblyzer voice encoder running on torch."""
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .interfaces import SpeakerEncoder
+from .onnx_speaker_encoder import EMBEDDING_SIZE
+
+
+class ResemblyzerSpeakerEncoder(SpeakerEncoder):
+    """Pretrained resemblyzer VoiceEncoder, utterances are embedded one by one."""
+
+    def __init__(self) -> None:
+        """Load model, torch and resemblyzer are imported here."""
+        from resemblyzer import VoiceEncoder  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+
+        self._encoder = VoiceEncoder("cpu")
+
+    def embed_utterances(self, wavs: Sequence[npt.NDArray[np.float32]]) -> npt.NDArray[np.float32]:
+        if not wavs:
+            return np.zeros((0, EMBEDDING_SIZE), dtype=np.float32)
+        return np.array([self._encoder.embed_utterance(wav) for wav in wavs], dtype=np.float32)  # pyright: ignore[reportUnknownMemberType]
@@ -2,34 +2,56 @@
 
 import asyncio
 import io
+import logging
 import queue
 import threading
-from collections.abc import AsyncIterator
 from operator import itemgetter
+from pathlib import Path
+from typing import Literal
 
-import librosa
 import numpy as np
-import torch
+import numpy.typing as npt
 from aiofiles.threadpool.binary import AsyncBufferedReader
-from resemblyzer import VoiceEncoder  # pyright: ignore[reportMissingTypeStubs]
-from silero_vad import (  # pyright: ignore[reportMissingTypeStubs]
-    get_speech_timestamps,  # pyright: ignore[reportUnknownVariableType]
-    load_silero_vad,
-)
-from sklearn.cluster import AgglomerativeClustering  # pyright: ignore[reportMissingTypeStubs]
 
-from .interfaces import DiarizationService, SpeakerSegment
+from speech_recognition.futures import set_future_exception, set_future_result
+from speech_recognition.transcript.columnar_transcript import UNKNOWN_SPEAKER, ColumnarTranscript
+
+from .interfaces import DiarizationService, SpeakerEncoder
+from .speaker_registry import SpeakerRegistry
+
+logger = logging.getLogger(__name__)
 
 
 class ResemblyzerWithSileroVADDiarizationService(DiarizationService):
     __MIN_SEGMENT_LENGTH = 0.3
     __SAMPLE_RATE = 16000
 
-    def __init__(self) -> None:
-        """Init service."""
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        threads: int = 0,
+        interop_threads: int = 0,
+        embeddings_engine: Literal["torch", "onnx"] = "torch",
+        onnx_encoder_path: Path = Path("./models/voice_encoder.onnx"),
+        speaker_registry: SpeakerRegistry | None = None,
+        speaker_match_threshold: float = 0.8,
+    ) -> None:
+        """Init service.
+
+        Speaker embeddings are computed with threads intra-op and interop_threads inter-op threads,
+        0 keeps library default. Engine "onnx" runs the same encoder exported by export_voice_encoder
+        with onnxruntime, embeddings of all segments are computed in batches.
+        With speaker_registry clusters whose centroid is closer than speaker_match_threshold (cosine
+        similarity) to an enrolled speaker are labeled with speaker name.
+        """
         super().__init__()
-
-        self._task_queue: queue.Queue[tuple[asyncio.Future[list[SpeakerSegment]], bytes, int | None] | None] = (
+        self._threads = threads
+        self._interop_threads = interop_threads
+        self._embeddings_engine: Literal["torch", "onnx"] = embeddings_engine
+        self._onnx_encoder_path = onnx_encoder_path
+        self._speaker_registry = speaker_registry
+        self._speaker_match_threshold = speaker_match_threshold
+
+        self._task_queue: queue.Queue[tuple[asyncio.Future[ColumnarTranscript], bytes, int | None] | None] = (
             queue.Queue()
         )
         self._stop_event = threading.Event()
@@ -37,7 +59,18 @@ class ResemblyzerWithSileroVADDiarizationService(DiarizationService):
         self._diarization_thread.start()
 
     def _diarization_worker(self) -> None:
-        embeddings_model = VoiceEncoder("cpu")
+        # heavy libraries are imported by worker thread, so importing service module is fast
+        import librosa  # noqa: PLC0415
+        import torch  # noqa: PLC0415
+        from silero_vad import (  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+            get_speech_timestamps,  # pyright: ignore[reportUnknownVariableType]
+            load_silero_vad,
+        )
+        from sklearn.cluster import AgglomerativeClustering  # pyright: ignore[reportMissingTypeStubs]  # noqa: PLC0415
+
+        set_torch_threads(self._threads, self._interop_threads)
+
+        embeddings_model = create_speaker_encoder(self._embeddings_engine, self._onnx_encoder_path, self._threads)
         vad_model = load_silero_vad(onnx=True)  # pyright: ignore[reportUnknownVariableType]
 
         while not self._stop_event.is_set():
@@ -56,7 +89,7 @@ class ResemblyzerWithSileroVADDiarizationService(DiarizationService):
                         return_seconds=True,
                     )
 
-                    embeddings = []
+                    segments = []
                     valid_segments = []
                     for start, end in map(itemgetter("start", "end"), speech_timestamps):  # pyright: ignore[reportUnknownArgumentType]
                         start_sample = int(start * self.__SAMPLE_RATE)
@@ -67,56 +100,106 @@ class ResemblyzerWithSileroVADDiarizationService(DiarizationService):
                         if len(segment) < need_samples_count:
                             segment = np.pad(segment, (0, need_samples_count - len(segment)))
 
-                        embeddings.append(embeddings_model.embed_utterance(segment))  # pyright: ignore[reportUnknownMemberType]
+                        segments.append(segment)  # pyright: ignore[reportUnknownMemberType]
                         valid_segments.append({"start": start, "end": end})  # pyright: ignore[reportUnknownMemberType]
 
-                    embeddings = np.array(embeddings)  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+                    embeddings = embeddings_model.embed_utterances(segments)  # pyright: ignore[reportUnknownArgumentType]
 
                     labels = []
-                    if len(embeddings) > 1:  # pyright: ignore[reportUnknownArgumentType]
+                    if len(embeddings) > 1:
                         clustering = AgglomerativeClustering(
                             n_clusters=n_speakers,  # pyright: ignore[reportArgumentType]
                             distance_threshold=0.90 if n_speakers is None else None,
                         )
                         labels = clustering.fit_predict(embeddings)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType, reportUnknownArgumentType]
 
-                    result = []
-                    for i, seg in enumerate(valid_segments):  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
-                        if seg["end"] - seg["start"] > self.__MIN_SEGMENT_LENGTH:
-                            result.append(  # pyright: ignore[reportUnknownMemberType]
-                                SpeakerSegment(
-                                    time=(seg["start"], seg["end"]),  # pyright: ignore[reportUnknownArgumentType]
-                                    key=f"SPEAKER_{labels[i] if i < len(labels) else 'UNKNOWN'}",  # pyright: ignore[reportUnknownArgumentType]
-                                ),
-                            )
-
-                    future.set_result(result)  # pyright: ignore[reportUnknownArgumentType]
+                    starts = np.array([seg["start"] for seg in valid_segments], dtype=np.float64)  # pyright: ignore[reportUnknownVariableType]
+                    ends = np.array([seg["end"] for seg in valid_segments], dtype=np.float64)  # pyright: ignore[reportUnknownVariableType]
+                    speakers = np.full(len(starts), UNKNOWN_SPEAKER, dtype=np.int32)
+                    speakers[: len(labels)] = labels  # pyright: ignore[reportUnknownArgumentType]
+                    keep = ends - starts > self.__MIN_SEGMENT_LENGTH
+
+                    result = ColumnarTranscript(
+                        starts[keep],
+                        ends[keep],
+                        speakers[keep],
+                        np.zeros(int(keep.sum()) + 1, dtype=np.int64),
+                        b"",
+                        self._speaker_labels(embeddings, speakers),
+                    )
+
+                    set_future_result(future, result)
                 except Exception as exc:  # noqa: BLE001
-                    future.set_exception(exc)
+                    set_future_exception(future, exc)
                 finally:
                     self._task_queue.task_done()
             except queue.Empty:
                 continue
 
+    def _speaker_labels(self, embeddings: npt.NDArray[np.float32], speakers: npt.NDArray[np.int32]) -> tuple[str, ...]:
+        """Return SPEAKER_n labels, clusters matched in registry are labeled with names."""
+        n_clusters = int(speakers.max(initial=-1)) + 1
+        labels = [f"SPEAKER_{speaker}" for speaker in range(n_clusters)]
+        if self._speaker_registry is None or not n_clusters:
+            return tuple(labels)
+
+        # centroids of all clusters are matched by one query
+        centroids = np.stack([embeddings[speakers == speaker].mean(axis=0) for speaker in range(n_clusters)])
+        names = self._speaker_registry.match(centroids, self._speaker_match_threshold)
+        return tuple(name or label for name, label in zip(names, labels, strict=True))
+
     async def get_segments_from_file(
         self,
         file: AsyncBufferedReader,
         n_speakers: int | None = None,
-    ) -> AsyncIterator[SpeakerSegment]:
-        """Return iterator with segments where speaker say in audio file."""
+    ) -> ColumnarTranscript:
+        """Return segments where speaker say in audio file."""
         audio_bytes = await file.read()
 
         loop = asyncio.get_event_loop()
-        future: asyncio.Future[list[SpeakerSegment]] = loop.create_future()
+        future: asyncio.Future[ColumnarTranscript] = loop.create_future()
 
         self._task_queue.put((future, audio_bytes, n_speakers))
-        result = await future
-
-        for segment in result:
-            yield segment
+        return await future
 
     def __del__(self) -> None:
         """Gracefully shut down the diarization thread."""
         self._stop_event.set()
         self._task_queue.put(None)
         self._diarization_thread.join(timeout=5.0)
+
+
+def create_speaker_encoder(
+    engine: Literal["torch", "onnx"],
+    onnx_encoder_path: Path,
+    threads: int = 0,
+) -> SpeakerEncoder:
+    """Load speaker embeddings model, torch or onnxruntime is imported here."""
+    if engine == "onnx":
+        from .onnx_speaker_encoder import OnnxSpeakerEncoder  # noqa: PLC0415
+
+        return OnnxSpeakerEncoder(onnx_encoder_path, threads)
+
+    from .resemblyzer_speaker_encoder import ResemblyzerSpeakerEncoder  # noqa: PLC0415
+
+    return ResemblyzerSpeakerEncoder()
+
+
+def set_torch_threads(threads: int, interop_threads: int) -> None:
+    """Set torch thread pools, 0 keeps current value.
+
+    Inter-op pool can be set only once per process, so with several services it is kept as is.
+    """
+    import torch  # noqa: PLC0415
+
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads and torch.get_num_interop_threads() != interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            logger.warning(
+                "Torch inter-op threads are already set to %d, %d is ignored",
+                torch.get_num_interop_threads(),
+                interop_threads,
+            )
@@ -0,0 +1,139 @@
+"""Enrolled speakers, cluster centroids of every job are matched against them."""
+
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+CENTROIDS_FILENAME = "centroids.npy"
+NAMES_FILENAME = "names.json"
+
+
+class SpeakerRegistry:
+    """Brute-force index of L2-normed speaker centroids, stored in directory.
+
+    Centroids are kept as one (speakers, embedding size) float32 matrix, so all cluster centroids of a job
+    are matched by one matrix multiplication. With mmap the matrix is memory-mapped from centroids.npy
+    instead of read into memory. Files changed by another process (enrollment CLI) are reloaded on match.
+    """
+
+    def __init__(self, directory: Path, *, mmap: bool = False) -> None:  # noqa: D107
+        self.directory = directory
+        self._mmap = mmap
+        self._lock = threading.Lock()
+        self._names: list[str] = []
+        self._centroids: npt.NDArray[np.float32] = np.zeros((0, 0), dtype=np.float32)
+        self._version: tuple[int, int] | None = None
+        self._reload()
+
+    @property
+    def names(self) -> list[str]:
+        """Names of enrolled speakers."""
+        with self._lock:
+            self._reload()
+            return list(self._names)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.names)
+
+    def enroll(self, name: str, embeddings: npt.NDArray[np.float32]) -> None:
+        """Save centroid of speaker embeddings (one or many rows), previous centroid of name is replaced."""
+        centroid = _normalize(np.atleast_2d(embeddings).mean(axis=0, keepdims=True))
+        with self._lock:
+            self._reload()
+            names = list(self._names)
+            centroids = np.asarray(self._centroids) if names else np.zeros((0, centroid.shape[1]), np.float32)
+
+            if name in names:
+                centroids = centroids.copy()
+                centroids[names.index(name)] = centroid[0]
+            else:
+                names.append(name)
+                centroids = np.concatenate([centroids, centroid])
+            self._write(names, centroids)
+
+    def remove(self, name: str) -> bool:
+        """Remove speaker, return False if name is not enrolled."""
+        with self._lock:
+            self._reload()
+            if name not in self._names:
+                return False
+
+            index = self._names.index(name)
+            self._write(
+                self._names[:index] + self._names[index + 1 :],
+                np.delete(np.asarray(self._centroids), index, axis=0),
+            )
+            return True
+
+    def match(self, centroids: npt.NDArray[np.float32], threshold: float) -> list[str | None]:
+        """Return enrolled name of every centroid, None if cosine similarity is below threshold.
+
+        Name is given at most to one centroid, the most similar one.
+        """
+        with self._lock:
+            self._reload()
+            names, enrolled = self._names, self._centroids
+
+        matches: list[str | None] = [None] * len(centroids)
+        if not names or not len(centroids):
+            return matches
+
+        scores = _normalize(np.asarray(centroids, dtype=np.float32)) @ enrolled.T
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+
+        # the most similar centroid of every name takes it, the others stay unknown
+        owner = np.full(len(names), -1)
+        for index in np.argsort(-best_scores):
+            if best_scores[index] >= threshold and owner[best[index]] < 0:
+                owner[best[index]] = index
+                matches[index] = names[best[index]]
+        return matches
+
+    def _reload(self) -> None:
+        """Read files if they were changed since last read, called under lock."""
+        names_path = self.directory / NAMES_FILENAME
+        try:
+            stat = names_path.stat()
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version == self._version:
+            return
+
+        if version is None:
+            names, centroids = [], np.zeros((0, 0), dtype=np.float32)
+        else:
+            names = json.loads(names_path.read_text(encoding="utf-8"))
+            centroids = np.load(self.directory / CENTROIDS_FILENAME, mmap_mode="r" if self._mmap else None)
+            if len(centroids) != len(names):
+                # files are being replaced by another process, previous ones are used until next match
+                return
+
+        self._names, self._centroids, self._version = names, centroids, version
+
+    def _write(self, names: list[str], centroids: npt.NDArray[np.float32]) -> None:
+        """Replace files, names are written last and mark new version for readers."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        centroids_path = self.directory / CENTROIDS_FILENAME
+        partial_path = centroids_path.with_name(centroids_path.name + ".tmp")
+        with partial_path.open("wb") as file:
+            np.save(file, centroids.astype(np.float32))
+        partial_path.replace(centroids_path)
+
+        names_path = self.directory / NAMES_FILENAME
+        partial_path = names_path.with_name(names_path.name + ".tmp")
+        partial_path.write_text(json.dumps(names, ensure_ascii=False), encoding="utf-8")
+        partial_path.replace(names_path)
+
+        self._version = None
+        self._reload()
+
+
+def _normalize(vectors: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
@@ -0,0 +1,26 @@
+"""Resolving asyncio futures from worker threads."""
+
+import asyncio
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def set_future_result(future: asyncio.Future[T], result: T) -> None:
+    """Set result from another thread, event loop is woken up at once."""
+
+    def set_result() -> None:
+        if not future.done():
+            future.set_result(result)
+
+    future.get_loop().call_soon_threadsafe(set_result)
+
+
+def set_future_exception(future: asyncio.Future[T], exc: BaseException) -> None:
+    """Set exception from another thread, event loop is woken up at once."""
+
+    def set_exception() -> None:
+        if not future.done():
+            future.set_exception(exc)
+
+    future.get_loop().call_soon_threadsafe(set_exception)
@@ -1 +1,4 @@
-"""Interval storage service module."""
+"""Interval storage service module.
+
+It is not used by the pipeline any more and is kept as reference for tests, intervaltree is a dev dependency.
+"""
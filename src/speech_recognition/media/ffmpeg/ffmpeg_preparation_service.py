@@ -18,7 +18,7 @@ class FfmpegPreparationService(MediaPreparationService):
     """Implementation preparing strategy. Using ffmpeg for preparing."""
 
     @asynccontextmanager
-    async def get_prepared_file(self, filename: Path):  # noqa: ANN201
+    async def get_prepared_file(self, filename: Path, *, denoise: bool = True):  # noqa: ANN201
         """Return path to prepared audio file."""
         if not filename.exists():
             msg = f"File: ({filename}) not found"
@@ -34,7 +34,7 @@ class FfmpegPreparationService(MediaPreparationService):
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmpfile:
                 tempfile_path = Path(tmpfile.name)
 
-            await asyncio.to_thread(self.__run_ffmpeg_pipeline, filename, tempfile_path)
+            await asyncio.to_thread(self.__run_ffmpeg_pipeline, filename, tempfile_path, denoise=denoise)
 
             async with aiofiles.open(tempfile_path, "rb") as opened_file:
                 yield opened_file
@@ -48,7 +48,24 @@ class FfmpegPreparationService(MediaPreparationService):
             if tempfile_path is not None and tempfile_path.exists():
                 tempfile_path.unlink()
 
-    def __run_ffmpeg_pipeline(self, filename: Path, tempfile_path: Path) -> None:
+    async def get_duration(self, filename: Path) -> float:
+        """Return media duration in seconds."""
+        try:
+            probe = await asyncio.to_thread(ffmpeg.probe, filename)
+        except Exception as e:
+            raise MediaFileCanNotBeReadError from e
+
+        return float(probe["format"]["duration"])
+
+    def __run_ffmpeg_pipeline(self, filename: Path, tempfile_path: Path, *, denoise: bool) -> None:
+        if not denoise:
+            # only decoding and resampling to the rate models work with
+            ffmpeg.input(filename).output(filename=tempfile_path, ar=16000, ac=1).run(
+                quiet=True,
+                overwrite_output=True,
+            )
+            return
+
         (
             ffmpeg.input(filename)
             .afftdn()
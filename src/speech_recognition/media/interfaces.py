@@ -10,6 +10,18 @@ from aiofiles.threadpool.binary import AsyncBufferedReader
 class MediaPreparationService(Protocol):
     """Interface for strategy preparing media for computing."""
 
-    def get_prepared_file(self, filename: Path) -> AbstractAsyncContextManager[AsyncBufferedReader]:
-        """Return path to prepared audio file."""
+    def get_prepared_file(
+        self,
+        filename: Path,
+        *,
+        denoise: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncBufferedReader]:
+        """Return path to prepared audio file.
+
+        Without denoise audio is only converted, it is faster and enough for short clean recordings.
+        """
+        ...
+
+    async def get_duration(self, filename: Path) -> float:
+        """Return media duration in seconds."""
         ...
@@ -8,6 +8,8 @@ from typing import Self
 import aiofiles
 from aiocsv import AsyncWriter
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
 from .interfaces import OutputService
 
 
@@ -48,3 +50,12 @@ class CsvFileOutputService(OutputService):
             raise RuntimeError
 
         await self._csv_writer.writerow((humanized_from, humanized_to, time_from, time_to, speaker_title, sentence))
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        if self._csv_writer is None:
+            raise RuntimeError
+
+        await self._csv_writer.writerows(
+            (str(timedelta(seconds=time_from)), str(timedelta(seconds=time_to)), time_from, time_to, speaker, sentence)
+            for time_from, time_to, sentence, speaker in transcript.rows()
+        )
@@ -4,24 +4,36 @@ from pathlib import Path
 from types import TracebackType
 from typing import Self
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
 from .csv_file_output_service import CsvFileOutputService
 from .interfaces import OutputService
+from .json_file_output_service import JsonFileOutputService
 from .txt_file_output_service import TxtFileOutputService
 from .txt_file_simple_output_service import TxtFileSimpleOutputService
 
 
 class FullOutputPipeline(OutputService):
-    """Pipeline: CSV + TXT (with speaker) + TXT simple."""
+    """Pipeline: CSV + TXT (with speaker) + TXT simple + optional JSON."""
 
-    def __init__(self, csv_filepath: Path, txt_filepath: Path, simple_txt_filepath: Path) -> None:  # noqa: D107
+    def __init__(  # noqa: D107
+        self,
+        csv_filepath: Path,
+        txt_filepath: Path,
+        simple_txt_filepath: Path,
+        json_filepath: Path | None = None,
+    ) -> None:
         self._csv = CsvFileOutputService(csv_filepath)
         self._txt = TxtFileOutputService(txt_filepath)
         self._simple = TxtFileSimpleOutputService(simple_txt_filepath)
+        self._json = JsonFileOutputService(json_filepath) if json_filepath is not None else None
 
     async def __aenter__(self) -> Self:  # noqa: D105
         await self._csv.__aenter__()
         await self._txt.__aenter__()
         await self._simple.__aenter__()
+        if self._json is not None:
+            await self._json.__aenter__()
         return self
 
     async def __aexit__(  # noqa: D105
@@ -33,8 +45,19 @@ class FullOutputPipeline(OutputService):
         await self._csv.__aexit__(exc_type, exc, tb)
         await self._txt.__aexit__(exc_type, exc, tb)
         await self._simple.__aexit__(exc_type, exc, tb)
+        if self._json is not None:
+            await self._json.__aexit__(exc_type, exc, tb)
 
     async def output(self, time_from: float, time_to: float, sentence: str, speaker_title: str) -> None:
         await self._csv.output(time_from, time_to, sentence, speaker_title)
         await self._txt.output(time_from, time_to, sentence, speaker_title)
         await self._simple.output(time_from, time_to, sentence, speaker_title)
+        if self._json is not None:
+            await self._json.output(time_from, time_to, sentence, speaker_title)
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        await self._csv.output_bulk(transcript)
+        await self._txt.output_bulk(transcript)
+        await self._simple.output_bulk(transcript)
+        if self._json is not None:
+            await self._json.output_bulk(transcript)
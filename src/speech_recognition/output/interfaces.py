@@ -3,6 +3,8 @@
 from types import TracebackType
 from typing import Protocol, Self
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
 
 class OutputService(Protocol):
     """Output for sentences by speaker."""
@@ -11,6 +13,10 @@ class OutputService(Protocol):
         """Output by speaker."""
         ...
 
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        """Output all rows of transcript."""
+        ...
+
     async def __aenter__(self) -> Self:  # noqa: D105
         ...
 
@@ -0,0 +1,63 @@
+"""Async JSON output implementation."""
+
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import aiofiles
+
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
+from .interfaces import OutputService
+
+
+class JsonFileOutputService(OutputService):
+    """Async output for sentences by speaker as JSON array."""
+
+    def __init__(self, filepath: Path) -> None:  # noqa: D107
+        super().__init__()
+        self._filepath = filepath
+        self._file = None
+        self._is_first = True
+
+    async def __aenter__(self) -> Self:  # noqa: D105
+        self._file = await aiofiles.open(self._filepath, "w", encoding="utf-8")
+        self._is_first = True
+        await self._file.write("[")
+        return self
+
+    async def __aexit__(  # noqa: D105
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._file:
+            await self._file.write("\n]\n")
+            await self._file.close()
+
+    async def output(self, time_from: float, time_to: float, sentence: str, speaker_title: str) -> None:
+        if not self._file:
+            raise RuntimeError
+
+        item = {"from": time_from, "to": time_to, "speaker": speaker_title, "sentence": sentence}
+        separator = "\n" if self._is_first else ",\n"
+        self._is_first = False
+
+        await self._file.write(separator + json.dumps(item, ensure_ascii=False))
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        if not self._file:
+            raise RuntimeError
+        if not len(transcript):
+            return
+
+        items = (
+            json.dumps({"from": time_from, "to": time_to, "speaker": speaker, "sentence": sentence}, ensure_ascii=False)
+            for time_from, time_to, sentence, speaker in transcript.rows()
+        )
+        separator = "\n" if self._is_first else ",\n"
+        self._is_first = False
+
+        await self._file.write(separator + ",\n".join(items))
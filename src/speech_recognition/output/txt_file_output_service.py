@@ -7,6 +7,8 @@ from typing import Self
 
 import aiofiles
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
 from .interfaces import OutputService
 
 
@@ -51,3 +53,14 @@ class TxtFileOutputService(OutputService):
 
         await self._file.write(f"{speaker_title}: [{humanized_from} - {humanized_to}]\n")
         await self._file.write(f"\t{sentence}\n")
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        if not self._file:
+            raise RuntimeError
+
+        await self._file.write(
+            "".join(
+                f"{speaker}: [{timedelta(seconds=time_from)} - {timedelta(seconds=time_to)}]\n\t{sentence}\n"
+                for time_from, time_to, sentence, speaker in transcript.rows()
+            ),
+        )
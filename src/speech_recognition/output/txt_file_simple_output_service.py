@@ -6,6 +6,8 @@ from typing import Self
 
 import aiofiles
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
 from .interfaces import OutputService
 
 
@@ -46,3 +48,9 @@ class TxtFileSimpleOutputService(OutputService):
             raise RuntimeError
 
         await self._file.write(sentence)
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        if not self._file:
+            raise RuntimeError
+
+        await self._file.write(transcript.joined_text())
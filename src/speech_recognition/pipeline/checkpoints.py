@@ -0,0 +1,108 @@
+"""Results of pipeline stages saved in job working directory."""
+
+import json
+import shutil
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+
+JOB_FILENAME = "job.json"
+CHECKPOINT_SUFFIX = ".npz"
+PARTIAL_SUFFIX = ".partial"
+
+
+class CheckpointStore:
+    """Stage results of one job, restarted job continues from the last finished stage.
+
+    Directory also keeps job description, so unfinished jobs can be found after restart.
+    """
+
+    def __init__(self, directory: Path) -> None:  # noqa: D107
+        self.directory = directory
+
+    def load(self, stage: str) -> ColumnarTranscript | None:
+        """Return result of finished stage."""
+        path = self._path(stage)
+        return ColumnarTranscript.load(path) if path.exists() else None
+
+    def save(self, stage: str, result: ColumnarTranscript) -> None:
+        """Save result of finished stage, partial result of the stage is removed."""
+        _write_atomic(self._path(stage), result.to_arrays())
+        self._path(stage + PARTIAL_SUFFIX).unlink(missing_ok=True)
+
+    def partial(self, stage: str) -> "PartialCheckpoint":
+        """Return checkpoint for unfinished transcription stage."""
+        return PartialCheckpoint(self._path(stage + PARTIAL_SUFFIX))
+
+    def clear(self) -> None:
+        """Remove results of all stages, job description is kept."""
+        for path in self.directory.glob(f"*{CHECKPOINT_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def save_job(self, job: Mapping[str, Any]) -> None:
+        """Save json serializable job description."""
+        path = self.directory / JOB_FILENAME
+        partial_path = path.with_name(path.name + ".tmp")
+        partial_path.write_text(json.dumps(job), encoding="utf-8")
+        partial_path.replace(path)
+
+    def load_job(self) -> dict[str, Any] | None:
+        """Return job description."""
+        path = self.directory / JOB_FILENAME
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _path(self, stage: str) -> Path:
+        return self.directory / f"{stage}{CHECKPOINT_SUFFIX}"
+
+
+class PartialCheckpoint(TranscriptionCheckpoint):
+    """Words transcribed before offset, saved by transcription worker thread."""
+
+    def __init__(self, path: Path) -> None:  # noqa: D107
+        self.path = path
+
+    def load(self) -> tuple[ColumnarTranscript, float] | None:
+        if not self.path.exists():
+            return None
+
+        with np.load(self.path, allow_pickle=False) as data:
+            return ColumnarTranscript.from_arrays(data), float(data["offset"])
+
+    def save(self, words: ColumnarTranscript, offset: float) -> None:
+        _write_atomic(self.path, {"offset": np.array(offset), **words.to_arrays()})
+
+
+def find_jobs(root: Path, ttl: float) -> list[CheckpointStore]:
+    """Return stores of jobs in root, job directories not changed for ttl seconds are removed."""
+    if not root.is_dir():
+        return []
+
+    stores: list[CheckpointStore] = []
+    expired = time.time() - ttl
+    for directory in sorted(root.iterdir()):
+        if not directory.is_dir():
+            continue
+
+        if directory.stat().st_mtime < expired:
+            shutil.rmtree(directory, ignore_errors=True)
+        else:
+            stores.append(CheckpointStore(directory))
+
+    return stores
+
+
+def _write_atomic(path: Path, arrays: Mapping[str, npt.NDArray[Any]]) -> None:
+    """Write npz file, so interrupted write does not break previous checkpoint."""
+    partial_path = path.with_name(path.name + ".tmp")
+    with partial_path.open("wb") as file:
+        np.savez(file, **arrays)
+    partial_path.replace(path)
@@ -1,25 +1,33 @@
 """Entrypoint."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 
+import numpy as np
+
 from speech_recognition.diarization.interfaces import DiarizationService
-from speech_recognition.interval_storage.interfaces import IntervalStorageService
 from speech_recognition.media.interfaces import MediaPreparationService
 from speech_recognition.output.interfaces import OutputService
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript, align
 from speech_recognition.transcription.interfaces import TranscriptionService
 
+from .checkpoints import CheckpointStore
 from .interfaces import ProgressObserver
 
 
 class TranscriptionPipeline:
     """Transcription pipeline with aggregated high level logic."""
 
-    def __init__(  # noqa: PLR0913
+    SINGLE_SPEAKER_KEY = "SPEAKER_0"
+    WORDS_STAGE = "words"
+    SEGMENTS_STAGE = "segments"
+
+    def __init__(
         self,
         preparation: MediaPreparationService,
         diarization: DiarizationService,
         transcription: TranscriptionService,
-        interval_storage: IntervalStorageService,
         output: OutputService,
         progress_observer: ProgressObserver,
     ) -> None:
@@ -27,24 +35,74 @@ class TranscriptionPipeline:
         self._preparation = preparation
         self._diarization = diarization
         self._transcription = transcription
-        self._interval_storage = interval_storage
         self._output = output
         self.progress_observer = progress_observer
 
-    async def run_pipeline(self, filename: Path, n_speakers: int | None) -> None:
-        """Run audio computing."""
+    async def run_pipeline(
+        self,
+        filename: Path,
+        n_speakers: int | None,
+        *,
+        denoise: bool = True,
+        checkpoints: CheckpointStore | None = None,
+        skip_diarization: bool = False,
+    ) -> None:
+        """Run audio computing.
+
+        With skip_diarization all words are output as one segment of one speaker, it is meant for short notes.
+        With checkpoints results of finished stages are saved, and saved results are used instead of running stages.
+        """
         await self.progress_observer.update(0)
 
-        async with self._preparation.get_prepared_file(filename) as file:
+        async with self._preparation.get_prepared_file(filename, denoise=denoise) as file:
             await self.progress_observer.update(5)
 
-            async for word in self._transcription.transcribe(file):
-                self._interval_storage.store(word.time[0], word.time[1], word.word)
+            words = await self._run_stage(
+                checkpoints,
+                self.WORDS_STAGE,
+                lambda: self._transcription.transcribe(
+                    file,
+                    checkpoints.partial(self.WORDS_STAGE) if checkpoints is not None else None,
+                ),
+            )
 
-            await file.seek(0)
             await self.progress_observer.update(50)
-            async for segment in self._diarization.get_segments_from_file(file, n_speakers):
-                interval_data = self._interval_storage.get(segment.time[0], segment.time[1])
-                await self._output.output(segment.time[0], segment.time[1], "".join(interval_data), segment.key)
+            if skip_diarization:
+                if len(words):
+                    await self._output.output_bulk(self._single_segment(words))
+            else:
+                await file.seek(0)
+                segments = await self._run_stage(
+                    checkpoints,
+                    self.SEGMENTS_STAGE,
+                    lambda: self._diarization.get_segments_from_file(file, n_speakers),
+                )
+                await self._output.output_bulk(align(words, segments))
 
             await self.progress_observer.update(100)
+
+    async def _run_stage(
+        self,
+        checkpoints: CheckpointStore | None,
+        stage: str,
+        run: Callable[[], Awaitable[ColumnarTranscript]],
+    ) -> ColumnarTranscript:
+        if checkpoints is None:
+            return await run()
+
+        result = await asyncio.to_thread(checkpoints.load, stage)
+        if result is None:
+            result = await run()
+            await asyncio.to_thread(checkpoints.save, stage, result)
+        return result
+
+    def _single_segment(self, words: ColumnarTranscript) -> ColumnarTranscript:
+        """Return one row from first word start to last word end with text of all words."""
+        return ColumnarTranscript(
+            words.start[:1],
+            words.end[-1:],
+            np.zeros(1, dtype=np.int32),
+            words.offsets[[0, -1]],
+            words.text,
+            (self.SINGLE_SPEAKER_KEY,),
+        )
@@ -0,0 +1,10 @@
+"""Progress observer implementations."""
+
+from .interfaces import ProgressObserver
+
+
+class NullProgressObserver(ProgressObserver):
+    """Observer for jobs nobody watches, progress is ignored."""
+
+    async def update(self, percent: int) -> None:
+        pass
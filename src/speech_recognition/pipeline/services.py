@@ -0,0 +1,24 @@
+"""Services shared between pipelines."""
+
+from dataclasses import dataclass
+
+from speech_recognition.diarization.interfaces import DiarizationService
+from speech_recognition.media.interfaces import MediaPreparationService
+from speech_recognition.output.interfaces import OutputService
+from speech_recognition.transcription.interfaces import TranscriptionService
+
+from .interfaces import ProgressObserver
+from .pipeline import TranscriptionPipeline
+
+
+@dataclass(frozen=True)
+class PipelineServices:
+    """Model workers shared by all entrypoints (telegram bot, http api)."""
+
+    preparation: MediaPreparationService
+    diarization: DiarizationService
+    transcription: TranscriptionService
+
+    def get_pipeline(self, output: OutputService, observer: ProgressObserver) -> TranscriptionPipeline:
+        """Return pipeline for one job."""
+        return TranscriptionPipeline(self.preparation, self.diarization, self.transcription, output, observer)
@@ -0,0 +1,52 @@
+"""Splitting CPU cores between native thread pools of model workers."""
+
+from dataclasses import dataclass
+from typing import Self
+
+# silero vad onnx session always runs with one intra-op and one inter-op thread
+VAD_THREADS = 1
+
+
+@dataclass(frozen=True)
+class ThreadBudget:
+    """Threads of native pools of one process, 0 keeps library default (usually all cores).
+
+    whisper_workers CTranslate2 replicas run in parallel, each with whisper_threads intra-op threads.
+    Speaker embeddings model (torch) runs with diarization_threads intra-op and diarization_interop_threads
+    inter-op threads.
+    """
+
+    whisper_workers: int = 1
+    whisper_threads: int = 0
+    diarization_threads: int = 0
+    diarization_interop_threads: int = 0
+
+    @classmethod
+    def split(
+        cls,
+        cpu_threads: int,
+        whisper_workers: int = 1,
+        whisper_threads: int | None = None,
+        diarization_threads: int | None = None,
+    ) -> Self:
+        """Split cores: one for vad, quarter of the rest for speaker embeddings, the rest for whisper workers.
+
+        Explicitly passed thread counts are used as is.
+        """
+        available = max(1, cpu_threads - VAD_THREADS)
+        diarization = diarization_threads or max(1, available // 4)
+        whisper = whisper_threads or max(1, (available - diarization) // whisper_workers)
+        return cls(whisper_workers, whisper, diarization, 1)
+
+    @property
+    def total(self) -> int:
+        """Cores used by all pools when everything is busy, 0 if some pool uses library default."""
+        if not self.whisper_threads or not self.diarization_threads:
+            return 0
+        return self.whisper_workers * self.whisper_threads + self.diarization_threads + VAD_THREADS
+
+    def __str__(self) -> str:  # noqa: D105
+        return (
+            f"whisper: {self.whisper_workers}x{self.whisper_threads or 'default'}, "
+            f"diarization: {self.diarization_threads or 'default'}, vad: {VAD_THREADS}"
+        )
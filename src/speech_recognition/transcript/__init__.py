@@ -0,0 +1 @@
+"""Transcript module."""
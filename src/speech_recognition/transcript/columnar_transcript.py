@@ -0,0 +1,230 @@
+"""Column oriented transcript."""
+
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Self, overload
+
+import numpy as np
+import numpy.typing as npt
+
+UNKNOWN_SPEAKER = -1
+UNKNOWN_SPEAKER_LABEL = "SPEAKER_UNKNOWN"
+
+
+class ColumnarTranscript:
+    """Rows of (start, end, speaker, text) stored column by column.
+
+    Texts of all rows are stored in one utf-8 buffer, text of row i is text[offsets[i]:offsets[i + 1]],
+    so texts of neighbour rows can be joined without copying each row. Speaker is index in speaker_labels
+    or UNKNOWN_SPEAKER. Rows are sorted by start and do not overlap each other (words, speaker segments),
+    slices share arrays and text buffer with parent transcript.
+    """
+
+    __slots__ = ("_max_end", "end", "offsets", "speaker", "speaker_labels", "start", "text")
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        start: npt.NDArray[np.float64],
+        end: npt.NDArray[np.float64],
+        speaker: npt.NDArray[np.int32],
+        offsets: npt.NDArray[np.int64],
+        text: bytes,
+        speaker_labels: tuple[str, ...] = (),
+    ) -> None:
+        """Create transcript from columns, offsets has one item more than other columns."""
+        if not len(start) == len(end) == len(speaker) == len(offsets) - 1:
+            msg = "Columns have different length"
+            raise ValueError(msg)
+
+        self.start = start
+        self.end = end
+        self.speaker = speaker
+        self.offsets = offsets
+        self.text = text
+        self.speaker_labels = speaker_labels
+        self._max_end: npt.NDArray[np.float64] | None = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        starts: Sequence[float],
+        ends: Sequence[float],
+        texts: Sequence[str],
+        speakers: Sequence[int] | None = None,
+        speaker_labels: tuple[str, ...] = (),
+    ) -> Self:
+        """Create transcript from row values."""
+        encoded = [text.encode() for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=offsets[1:])
+
+        return cls(
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(ends, dtype=np.float64),
+            np.full(len(encoded), UNKNOWN_SPEAKER, dtype=np.int32)
+            if speakers is None
+            else np.asarray(speakers, dtype=np.int32),
+            offsets,
+            b"".join(encoded),
+            speaker_labels,
+        )
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Create transcript without rows."""
+        return cls.from_rows([], [], [])
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.start)
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[float, float, str, str]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ColumnarTranscript": ...
+
+    def __getitem__(self, index: int | slice) -> "tuple[float, float, str, str] | ColumnarTranscript":
+        """Return (start, end, text, speaker label) of row or transcript view for slice."""
+        if isinstance(index, int):
+            index = range(len(self))[index]
+            return float(self.start[index]), float(self.end[index]), self.text_at(index), self.speaker_label(index)
+
+        first, last, step = index.indices(len(self))
+        if step != 1:
+            msg = "Only contiguous slices are supported"
+            raise ValueError(msg)
+
+        last = max(first, last)
+        return ColumnarTranscript(
+            self.start[first:last],
+            self.end[first:last],
+            self.speaker[first:last],
+            self.offsets[first : last + 1],
+            self.text,
+            self.speaker_labels,
+        )
+
+    def text_at(self, index: int) -> str:
+        """Return text of row."""
+        # negative index would take end offset from the other end of offsets
+        index = range(len(self))[index]
+        return self.text[self.offsets[index] : self.offsets[index + 1]].decode()
+
+    def texts(self) -> list[str]:
+        """Return texts of all rows."""
+        return [self.text_at(index) for index in range(len(self))]
+
+    def rows(self) -> Iterator[tuple[float, float, str, str]]:
+        """Iterate over (start, end, text, speaker label) of rows."""
+        labels = [self.speaker_label(index) for index in range(len(self))]
+        return zip(self.start.tolist(), self.end.tolist(), self.texts(), labels, strict=True)
+
+    def joined_text(self) -> str:
+        """Return texts of all rows joined together."""
+        return self.text[self.offsets[0] : self.offsets[-1]].decode()
+
+    def speaker_label(self, index: int) -> str:
+        """Return label of row speaker."""
+        speaker = int(self.speaker[index])
+        if 0 <= speaker < len(self.speaker_labels):
+            return self.speaker_labels[speaker]
+        return UNKNOWN_SPEAKER_LABEL
+
+    def overlapping_range(
+        self,
+        time_from: npt.ArrayLike,
+        time_to: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Return [first, last) row ranges overlapping intervals [time_from, time_to), vectorized over intervals."""
+        if self._max_end is None:
+            # zero length rows still overlap interval they are in
+            end = np.where(self.end == self.start, self.start + 0.001, self.end)
+            self._max_end = np.maximum.accumulate(end) if len(self) else end
+
+        first = np.searchsorted(self._max_end, time_from, side="right")
+        last = np.maximum(np.searchsorted(self.start, time_to, side="left"), first)
+        return first, last
+
+    def slice_time(self, time_from: float, time_to: float) -> "ColumnarTranscript":
+        """Return view of rows overlapping [time_from, time_to)."""
+        first, last = self.overlapping_range(time_from, time_to)
+        return self[int(first) : int(last)]
+
+    def shifted(self, offset: float, max_end: float | None = None) -> "ColumnarTranscript":
+        """Return copy with times moved by offset, ends are limited by max_end before moving."""
+        end = self.end if max_end is None else np.minimum(self.end, max_end)
+        start = self.start + offset
+        return ColumnarTranscript(
+            start,
+            np.maximum(end + offset, start),
+            self.speaker,
+            self.offsets,
+            self.text,
+            self.speaker_labels,
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["ColumnarTranscript"]) -> "ColumnarTranscript":
+        """Join transcripts with the same speaker labels, rows of every part go after rows of previous one."""
+        if not parts:
+            return cls.empty()
+
+        texts = [part.text[part.offsets[0] : part.offsets[-1]] for part in parts]
+        offsets = np.zeros(sum(len(part) for part in parts) + 1, dtype=np.int64)
+        np.cumsum(np.concatenate([np.diff(part.offsets) for part in parts]), out=offsets[1:])
+
+        return cls(
+            np.concatenate([part.start for part in parts]),
+            np.concatenate([part.end for part in parts]),
+            np.concatenate([part.speaker for part in parts]),
+            offsets,
+            b"".join(texts),
+            parts[0].speaker_labels,
+        )
+
+    def to_arrays(self) -> dict[str, npt.NDArray[Any]]:
+        """Return columns as arrays, text buffer contains only texts of these rows."""
+        first, last = int(self.offsets[0]), int(self.offsets[-1])
+        return {
+            "start": self.start,
+            "end": self.end,
+            "speaker": self.speaker,
+            "offsets": self.offsets - first,
+            "text": np.frombuffer(self.text[first:last], dtype=np.uint8),
+            "speaker_labels": np.array(self.speaker_labels, dtype=np.str_),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, npt.NDArray[Any]]) -> Self:
+        """Create transcript from arrays returned by to_arrays."""
+        return cls(
+            arrays["start"],
+            arrays["end"],
+            arrays["speaker"],
+            arrays["offsets"],
+            arrays["text"].tobytes(),
+            tuple(str(label) for label in arrays["speaker_labels"]),
+        )
+
+    def save(self, path: Path) -> None:
+        """Save transcript to npz file."""
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Load transcript saved by save."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays(data)
+
+
+def align(words: ColumnarTranscript, segments: ColumnarTranscript) -> ColumnarTranscript:
+    """Return speaker segments with text of words overlapping every segment."""
+    first, last = words.overlapping_range(segments.start, segments.end)
+    byte_from = words.offsets[first]
+    byte_to = words.offsets[last]
+
+    offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+    np.cumsum(byte_to - byte_from, out=offsets[1:])
+    text = b"".join(words.text[start:end] for start, end in zip(byte_from.tolist(), byte_to.tolist(), strict=True))
+
+    return ColumnarTranscript(segments.start, segments.end, segments.speaker, offsets, text, segments.speaker_labels)
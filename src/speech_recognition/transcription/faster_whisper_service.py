@@ -4,20 +4,63 @@ import asyncio
 import io
 import queue
 import threading
-from collections.abc import AsyncIterator
+import time
+from collections import deque
 from pathlib import Path
+from typing import TYPE_CHECKING, TypeAlias, cast
 
 from aiofiles.threadpool.binary import AsyncBufferedReader
-from faster_whisper import WhisperModel  # type: ignore  # noqa: PGH003
 
-from .interfaces import SpeechWord, TranscriptionService
+from speech_recognition.futures import set_future_exception, set_future_result
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
+from .interfaces import TranscriptionCheckpoint, TranscriptionService
+from .micro_batching import SAMPLE_RATE, collect_batch, concatenate, keep_speech, restore_time, split_words
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import numpy as np
+    import numpy.typing as npt
+    from faster_whisper import BatchedInferencePipeline, WhisperModel  # type: ignore  # noqa: PGH003
+    from faster_whisper.transcribe import Word  # type: ignore  # noqa: PGH003
+
+_Task: TypeAlias = "tuple[asyncio.Future[ColumnarTranscript], npt.NDArray[np.float32], TranscriptionCheckpoint | None]"
 
 
 class FasterWhisperTranscriptionService(TranscriptionService):
-    def __init__(self, device: str = "auto") -> None:
-        """Init transcribe service."""
+    # whisper window, shorter audio is transcribed in one chunk and can be batched with other jobs
+    __MAX_BATCHED_DURATION = 30.0
+
+    def __init__(  # noqa: PLR0913
+        self,
+        device: str = "auto",
+        batch_size: int = 8,
+        batch_max_wait: float = 0.2,
+        language: str | None = None,
+        *,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        checkpoint_interval: float = 60.0,
+    ) -> None:
+        """Init transcribe service.
+
+        Jobs shorter than 30 seconds arriving within batch_max_wait seconds are transcribed
+        together, up to batch_size jobs in one batch. batch_size=1 disables batching.
+        Batch is transcribed in one language, so without language it is detected for every job first.
+        num_workers jobs are transcribed in parallel, each with cpu_threads threads (0 - CTranslate2 default).
+        Long jobs with checkpoint save words at whisper segment boundaries every checkpoint_interval seconds.
+        """
         self._device = device
-        self._task_queue: queue.Queue[tuple[asyncio.Future[list[SpeechWord]], bytes] | None] = queue.Queue()
+        self._cpu_threads = cpu_threads
+        self._num_workers = num_workers
+        self._checkpoint_interval = checkpoint_interval
+        self._batch_size = batch_size
+        self._batch_max_wait = batch_max_wait
+        self._language = language
+        self._task_queue: queue.Queue[
+            tuple[asyncio.Future[ColumnarTranscript], bytes, TranscriptionCheckpoint | None] | None
+        ] = queue.Queue()
         self._stop_event = threading.Event()
 
         self._inference_thread = threading.Thread(target=self._inference_worker, daemon=True)
@@ -25,49 +68,185 @@ class FasterWhisperTranscriptionService(TranscriptionService):
 
     def _inference_worker(self) -> None:
         """Рабочий поток: загружает модель и обрабатывает задачи."""
-        model = WhisperModel(str(Path("./models/medium")), device=self._device)
+        # faster_whisper is imported by worker thread, so importing service module is fast
+        from faster_whisper import BatchedInferencePipeline, WhisperModel  # type: ignore  # noqa: PGH003, PLC0415
+
+        model = WhisperModel(
+            str(Path("./models/medium")),
+            device=self._device,
+            cpu_threads=self._cpu_threads,
+            num_workers=self._num_workers,
+        )
+        batched_model = BatchedInferencePipeline(model)
+
+        # model replicas are used by parallel calls, one calling thread for every replica
+        replicas = [
+            threading.Thread(target=self._serve, args=(model, batched_model), daemon=True)
+            for _ in range(self._num_workers - 1)
+        ]
+        for replica in replicas:
+            replica.start()
+
+        self._serve(model, batched_model)
+
+    def _serve(self, model: "WhisperModel", batched_model: "BatchedInferencePipeline") -> None:
+        deferred: deque[_Task] = deque()
 
         while not self._stop_event.is_set():
+            task = deferred.popleft() if deferred else self._get_task(timeout=1.0)
+            if task is None:
+                continue
+
+            if self._batch_size > 1 and self._is_short(task):
+                batch, long_tasks = collect_batch(
+                    task,
+                    self._get_task,
+                    self._is_short,
+                    self._batch_size,
+                    self._batch_max_wait,
+                )
+                deferred.extend(long_tasks)
+                if len(batch) > 1:
+                    self._run_batch(model, batched_model, batch)
+                else:
+                    self._run_single(model, task)
+            else:
+                self._run_single(model, task)
+
+        # jobs left after stop would wait for results forever
+        error = RuntimeError("Transcription service is stopped")
+        for future, _, _ in deferred:
+            set_future_exception(future, error)
+        while True:
             try:
-                task = self._task_queue.get(timeout=1.0)
-
-                if task is None:
-                    break
-
-                future, data = task
-                try:
-                    segments, _ = model.transcribe(  # pyright: ignore[reportUnknownMemberType]
-                        io.BytesIO(data),
-                        word_timestamps=True,
-                        vad_filter=True,
-                    )
-                    result = [
-                        SpeechWord((word.start, word.end), word.word)
-                        for segment in segments
-                        if segment.words
-                        for word in segment.words
-                    ]
-                    future.set_result(result)
-                except Exception as exc:  # noqa: BLE001
-                    future.set_exception(exc)
-                finally:
-                    self._task_queue.task_done()
+                item = self._task_queue.get_nowait()
             except queue.Empty:
+                break
+            if item is not None:
+                set_future_exception(item[0], error)
+            self._task_queue.task_done()
+
+    def _get_task(self, timeout: float) -> "_Task | None":
+        try:
+            item = self._task_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        try:
+            if item is None:
+                self._stop_event.set()
+                return None
+
+            from faster_whisper import decode_audio  # type: ignore  # noqa: PGH003, PLC0415
+
+            future, data, checkpoint = item
+            try:
+                # without split_stereo audio is one mono float32 array
+                audio = cast("npt.NDArray[np.float32]", decode_audio(io.BytesIO(data), sampling_rate=SAMPLE_RATE))
+            except Exception as exc:  # noqa: BLE001
+                set_future_exception(future, exc)
+                return None
+
+            return future, audio, checkpoint
+        finally:
+            self._task_queue.task_done()
+
+    def _is_short(self, task: _Task) -> bool:
+        return len(task[1]) <= self.__MAX_BATCHED_DURATION * SAMPLE_RATE
+
+    def _run_single(self, model: "WhisperModel", task: _Task) -> None:
+        future, audio, checkpoint = task
+        try:
+            resumed = checkpoint.load() if checkpoint is not None else None
+            parts, offset = ([resumed[0]], resumed[1]) if resumed is not None else ([], 0.0)
+
+            segments, _ = model.transcribe(  # pyright: ignore[reportUnknownMemberType]
+                audio[int(offset * SAMPLE_RATE) :],
+                language=self._language,
+                word_timestamps=True,
+                vad_filter=True,
+            )
+
+            words: list[Word] = []
+            saved_at = time.monotonic()
+            for segment in segments:
+                words.extend(segment.words or ())
+                if checkpoint is not None and time.monotonic() - saved_at >= self._checkpoint_interval:
+                    parts.append(_to_transcript(words, offset))
+                    words = []
+                    checkpoint.save(ColumnarTranscript.concatenate(parts), offset + segment.end)
+                    saved_at = time.monotonic()
+
+            parts.append(_to_transcript(words, offset))
+            set_future_result(future, ColumnarTranscript.concatenate(parts))
+        except Exception as exc:  # noqa: BLE001
+            set_future_exception(future, exc)
+
+    def _run_batch(
+        self,
+        model: "WhisperModel",
+        batched_model: "BatchedInferencePipeline",
+        batch: list[_Task],
+    ) -> None:
+        """Transcribe speech of short jobs in one call, vad is applied to every job like in _run_single."""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps  # type: ignore  # noqa: PGH003, PLC0415
+
+        groups: dict[str | None, list[tuple[_Task, list[dict[str, int]]]]] = {}
+        for task in batch:
+            future, audio, _ = task
+            try:
+                speech = get_speech_timestamps(audio, VadOptions())  # pyright: ignore[reportUnknownVariableType]
+                if not speech:
+                    set_future_result(future, ColumnarTranscript.empty())
+                    continue
+                language = self._language
+                if language is None:
+                    language, _, _ = model.detect_language(audio)  # pyright: ignore[reportUnknownMemberType]
+            except Exception as exc:  # noqa: BLE001
+                set_future_exception(future, exc)
                 continue
+            groups.setdefault(language, []).append((task, speech))  # pyright: ignore[reportUnknownArgumentType]
+
+        for language, tasks in groups.items():
+            try:
+                joined_audio, clips = concatenate([keep_speech(audio, speech) for (_, audio, _), speech in tasks])
+                segments, _ = batched_model.transcribe(  # pyright: ignore[reportUnknownMemberType]
+                    joined_audio,
+                    language=language,
+                    word_timestamps=True,
+                    clip_timestamps=[{"start": start, "end": end} for start, end in clips],
+                    batch_size=self._batch_size,
+                )
+                words = _to_transcript(word for segment in segments if segment.words for word in segment.words)
+                for ((future, _, _), speech), result in zip(tasks, split_words(words, clips), strict=True):
+                    set_future_result(future, restore_time(result, speech))
+            except Exception as exc:  # noqa: BLE001
+                for (future, _, _), _ in tasks:
+                    set_future_exception(future, exc)
 
-    async def transcribe(self, file: AsyncBufferedReader) -> AsyncIterator[SpeechWord]:
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,
+        checkpoint: TranscriptionCheckpoint | None = None,
+    ) -> ColumnarTranscript:
         """Отправляет задачу в выделенный поток и ждёт результата."""
         loop = asyncio.get_event_loop()
-        future: asyncio.Future[list[SpeechWord]] = loop.create_future()
-
-        self._task_queue.put((future, await file.read()))
-        result = await future
+        future: asyncio.Future[ColumnarTranscript] = loop.create_future()
 
-        for word in result:
-            yield word
+        self._task_queue.put((future, await file.read(), checkpoint))
+        return await future
 
     def __del__(self) -> None:
         """Gracefully shut down the diarization thread."""
         self._stop_event.set()
         self._task_queue.put(None)
         self._inference_thread.join(timeout=5.0)
+
+
+def _to_transcript(words: "Iterable[Word]", offset: float = 0.0) -> ColumnarTranscript:
+    words = list(words)
+    return ColumnarTranscript.from_rows(
+        [word.start + offset for word in words],
+        [word.end + offset for word in words],
+        [word.word for word in words],
+    )
@@ -1,23 +1,34 @@
 """Contains interfaces for transcription module."""
 
-from collections.abc import AsyncIterator
-from dataclasses import dataclass
 from typing import Protocol
 
 from aiofiles.threadpool.binary import AsyncBufferedReader
 
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
 
-@dataclass(frozen=True)
-class SpeechWord:
-    """Word and timestamp."""
 
-    time: tuple[float, float]
-    word: str
+class TranscriptionCheckpoint(Protocol):
+    """Storage for words of partially transcribed file, used from worker threads."""
+
+    def load(self) -> tuple[ColumnarTranscript, float] | None:
+        """Return words transcribed before offset (seconds) and offset."""
+        ...
+
+    def save(self, words: ColumnarTranscript, offset: float) -> None:
+        """Save words transcribed before offset (seconds)."""
+        ...
 
 
 class TranscriptionService(Protocol):
     """Service for transcription speech in wav file."""
 
-    def transcribe(self, file: AsyncBufferedReader) -> AsyncIterator[SpeechWord]:
-        """Transcribe speech from wav file."""
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,
+        checkpoint: TranscriptionCheckpoint | None = None,
+    ) -> ColumnarTranscript:
+        """Transcribe speech from wav file, one row per word.
+
+        With checkpoint transcription continues from saved offset and progress is saved periodically.
+        """
         ...
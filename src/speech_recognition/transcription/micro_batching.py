@@ -0,0 +1,105 @@
+"""Helpers for transcribing short jobs in one batch."""
+
+import time
+from collections.abc import Callable, Mapping, Sequence
+from typing import Literal, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+
+SAMPLE_RATE = 16000
+
+T = TypeVar("T")
+
+
+def collect_batch(
+    first: T,
+    get_next: Callable[[float], T | None],
+    is_short: Callable[[T], bool],
+    batch_size: int,
+    max_wait: float,
+) -> tuple[list[T], list[T]]:
+    """Collect short tasks for one batch during max_wait seconds.
+
+    get_next waits next task no longer than passed timeout and returns None if there is no task.
+    Long tasks received while collecting are returned separately and must be run one by one.
+    """
+    batch = [first]
+    deferred: list[T] = []
+    deadline = time.monotonic() + max_wait
+
+    while len(batch) < batch_size:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+
+        task = get_next(timeout)
+        if task is None:
+            break
+
+        (batch if is_short(task) else deferred).append(task)
+
+    return batch, deferred
+
+
+def concatenate(
+    audios: Sequence[npt.NDArray[np.float32]],
+    gap: float = 1.0,
+) -> tuple[npt.NDArray[np.float32], list[tuple[float, float]]]:
+    """Join audios with silence between them, return joined audio and (start, end) of every audio in seconds."""
+    silence = np.zeros(int(gap * SAMPLE_RATE), dtype=np.float32)
+    parts: list[npt.NDArray[np.float32]] = []
+    clips: list[tuple[float, float]] = []
+
+    position = 0
+    for audio in audios:
+        clips.append((position / SAMPLE_RATE, (position + len(audio)) / SAMPLE_RATE))
+        parts.extend((audio, silence))
+        position += len(audio) + len(silence)
+
+    return np.concatenate(parts), clips
+
+
+def split_words(words: ColumnarTranscript, clips: Sequence[tuple[float, float]]) -> list[ColumnarTranscript]:
+    """Split words of joined audio by clips, word time becomes relative to its clip."""
+    starts = np.array([start for start, _ in clips], dtype=np.float64)
+    # words are sorted by start, so words of every clip are one contiguous range
+    bounds = [0, *np.searchsorted(words.start, starts[1:], side="left").tolist(), len(words)]
+
+    return [
+        words[first:last].shifted(-clip_start, clip_end)
+        for first, last, (clip_start, clip_end) in zip(bounds[:-1], bounds[1:], clips, strict=True)
+    ]
+
+
+def keep_speech(audio: npt.NDArray[np.float32], chunks: Sequence[Mapping[str, int]]) -> npt.NDArray[np.float32]:
+    """Return only speech of audio, chunks are vad {"start", "end"} in samples."""
+    if not chunks:
+        return audio[:0]
+    return np.concatenate([audio[chunk["start"] : chunk["end"]] for chunk in chunks])
+
+
+def restore_time(words: ColumnarTranscript, chunks: Sequence[Mapping[str, int]]) -> ColumnarTranscript:
+    """Move word time from audio returned by keep_speech back to original audio."""
+    if not chunks or not len(words):
+        return words
+
+    chunk_starts = np.array([chunk["start"] for chunk in chunks], dtype=np.float64) / SAMPLE_RATE
+    lengths = np.array([chunk["end"] - chunk["start"] for chunk in chunks], dtype=np.float64) / SAMPLE_RATE
+    speech_starts = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+
+    def restore(times: npt.NDArray[np.float64], side: Literal["left", "right"]) -> npt.NDArray[np.float64]:
+        # word end on chunk boundary belongs to the chunk before it, word start to the chunk after it
+        index = np.clip(np.searchsorted(speech_starts, times, side=side) - 1, 0, len(chunks) - 1)
+        return times - speech_starts[index] + chunk_starts[index]
+
+    return ColumnarTranscript(
+        restore(words.start, "right"),
+        restore(words.end, "left"),
+        words.speaker,
+        words.offsets,
+        words.text,
+        words.speaker_labels,
+    )
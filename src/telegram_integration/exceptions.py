@@ -0,0 +1,13 @@
+"""Exceptions for telegram integration module."""
+
+
+class TelegramIntegrationError(Exception):
+    """Base error class for telegram integration module."""
+
+
+class TelegramFileTooBigError(TelegramIntegrationError):
+    """File is bigger than Bot API server allows to download."""
+
+
+class TelegramFileNotAvailableError(TelegramIntegrationError):
+    """Bot API server did not return path to file."""
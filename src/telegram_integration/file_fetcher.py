@@ -0,0 +1,53 @@
+"""Getting files sent to the bot."""
+
+import asyncio
+from pathlib import Path
+
+from aiogram import Bot
+
+from .exceptions import TelegramFileNotAvailableError, TelegramFileTooBigError
+
+
+class TelegramFileFetcher:
+    """Return local path to file sent to the bot.
+
+    Public Bot API gives files only over HTTP and only up to 20 MB. Self-hosted Bot API server
+    in local mode returns absolute path on its disk, such file is used in place without copying.
+    """
+
+    PUBLIC_API_DOWNLOAD_LIMIT = 20 * 1024 * 1024
+
+    def __init__(self, bot: Bot) -> None:  # noqa: D107
+        self._bot = bot
+
+    @property
+    def is_local(self) -> bool:
+        """Bot API server works in local mode."""
+        return self._bot.session.api.is_local
+
+    def check_size(self, file_size: int | None) -> None:
+        """Raise error if file can not be downloaded from Bot API server."""
+        if not self.is_local and file_size is not None and file_size > self.PUBLIC_API_DOWNLOAD_LIMIT:
+            msg = f"File size {file_size} is bigger than {self.PUBLIC_API_DOWNLOAD_LIMIT} bytes"
+            raise TelegramFileTooBigError(msg)
+
+    async def fetch(self, file_id: str, file_size: int | None, workdir: Path) -> Path:
+        """Return path to file, public Bot API files are downloaded into workdir."""
+        self.check_size(file_size)
+
+        tg_file = await self._bot.get_file(file_id)
+        if tg_file.file_path is None:
+            msg = f"Bot API server did not return path for file: ({file_id})"
+            raise TelegramFileNotAvailableError(msg)
+
+        if self.is_local:
+            # aiogram resolves downloads from local server to the same path, so there is no fallback
+            local_path = Path(self._bot.session.api.wrap_local_file.to_local(tg_file.file_path))
+            if not await asyncio.to_thread(local_path.is_file):
+                msg = f"File of Bot API server is not available on local disk: {local_path}"
+                raise TelegramFileNotAvailableError(msg)
+            return local_path
+
+        destination = workdir / file_id
+        await self._bot.download_file(tg_file.file_path, destination)
+        return destination
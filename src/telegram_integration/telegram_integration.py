@@ -1,48 +1,73 @@
+import asyncio
+import logging
+import shutil
 import tempfile
+import time
 from pathlib import Path
+from typing import TypedDict
 
+import aiofiles
 from aiogram import Bot, Dispatcher, F, Router
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ContentType
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 from aiogram.filters import CommandStart
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import FSInputFile, KeyboardButton, Message, ReplyKeyboardMarkup, ReplyKeyboardRemove
 
-from speech_recognition.diarization.resemblyzer_with_silero_vad_diarization_service import (
-    ResemblyzerWithSileroVADDiarizationService,
-)
-from speech_recognition.interval_storage.intervaltree_storage_service import IntervalTreeStorageService
-from speech_recognition.media.ffmpeg.ffmpeg_preparation_service import FfmpegPreparationService
 from speech_recognition.output.full_output_pipeline import FullOutputPipeline
-from speech_recognition.pipeline.pipeline import TranscriptionPipeline
-from speech_recognition.transcription.faster_whisper_service import FasterWhisperTranscriptionService
+from speech_recognition.output.txt_file_simple_output_service import TxtFileSimpleOutputService
+from speech_recognition.pipeline.checkpoints import CheckpointStore, find_jobs
+from speech_recognition.pipeline.progress_observer import NullProgressObserver
+from speech_recognition.pipeline.services import PipelineServices
 
+from .exceptions import TelegramFileNotAvailableError, TelegramFileTooBigError
+from .file_fetcher import TelegramFileFetcher
 from .progress_observer import TelegramProgressObserver
 
-preparation_service = FfmpegPreparationService()
-diarization_service = ResemblyzerWithSileroVADDiarizationService()
-transcription_service = FasterWhisperTranscriptionService()
+logger = logging.getLogger(__name__)
 
+MESSAGE_MAX_LENGTH = 4096
 
-def get_pipeline(  # noqa: D103
-    output: FullOutputPipeline,
-    observer: TelegramProgressObserver,
-) -> TranscriptionPipeline:
-    return TranscriptionPipeline(
-        preparation_service,
-        diarization_service,
-        transcription_service,
-        IntervalTreeStorageService(),
-        output,
-        observer,
-    )
+
+class TelegramJob(TypedDict):
+    """Transcription requested in chat, saved in job directory."""
+
+    chat_id: int
+    file_id: str
+    file_size: int | None
+    speakers: int | None
 
 
 # TODO(0xfee1dead): refactoring https://github.com/0xFEE1DEAD/hush_transcribe_service/issues/1  # noqa: FIX002
 class TelegramBotApp:
-    def __init__(self, token: str) -> None:
-        """Init telegram bot."""
-        self.bot = Bot(token)
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        token: str,
+        services: PipelineServices,
+        api_server: TelegramAPIServer | None = None,
+        fast_path_max_duration: int = 60,
+        jobs_dir: Path | None = None,
+        checkpoint_ttl: float = 3 * 24 * 3600,
+    ) -> None:
+        """Init telegram bot.
+
+        Pass api_server for working with self-hosted Bot API server.
+        Voice and video notes not longer than fast_path_max_duration seconds are transcribed
+        at once as one speaker, transcript is sent as reply message. Their latency is logged.
+        With jobs_dir results of finished stages are saved there, and jobs interrupted by restart are
+        continued on start. Job directories older than checkpoint_ttl seconds are removed.
+        """
+        self.services = services
+        self.fast_path_max_duration = fast_path_max_duration
+        self.jobs_dir = jobs_dir
+        self.checkpoint_ttl = checkpoint_ttl
+        self._resumed_tasks: set[asyncio.Task[None]] = set()
+        session = AiohttpSession(api=api_server) if api_server is not None else None
+        self.bot = Bot(token, session=session)
+        self.file_fetcher = TelegramFileFetcher(self.bot)
         self.dp = Dispatcher()
         self.router = Router()
 
@@ -67,13 +92,24 @@ class TelegramBotApp:
             ),
         )
         async def handle_media(message: Message, state: FSMContext) -> None:  # pyright: ignore[reportUnusedFunction]
-            file_id = self.__extract_file_id(message)
+            extracted = self.__extract_file(message)
 
-            if file_id is None:
+            if extracted is None:
                 await message.answer("Ой, кажется не удалось получить файл, попробуй загрузить снова")
                 return
 
-            await state.update_data(file_id=file_id)
+            file_id, file_size = extracted
+            try:
+                self.file_fetcher.check_size(file_size)
+            except TelegramFileTooBigError:
+                await message.answer("Файл слишком большой, Telegram не даёт скачивать файлы больше 20 МБ")
+                return
+
+            if self.__is_short_note(message):
+                await self.__transcribe_short_note(message, file_id, file_size)
+                return
+
+            await state.update_data(file_id=file_id, file_size=file_size)
 
             speakers_keyboard = ReplyKeyboardMarkup(
                 keyboard=[
@@ -100,56 +136,138 @@ class TelegramBotApp:
             user_choice = message.text
             speakers = None if user_choice == "Авто" or user_choice is None else int(user_choice)
             data = await state.get_data()
-            file_id = data["file_id"]
-            tg_file = await self.bot.get_file(file_id)
+            job = TelegramJob(
+                chat_id=message.chat.id,
+                file_id=data["file_id"],
+                file_size=data.get("file_size"),
+                speakers=speakers,
+            )
+            await state.clear()
 
-            if tg_file.file_path is None:
-                await message.answer("Ой, кажется не удалось получить файл, попробуй загрузить снова")
+            await message.answer("Начинаю обработку…", reply_markup=ReplyKeyboardRemove())
+
+            if self.jobs_dir is None:
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    await self.__run_job(job, Path(tmpdir), None)
                 return
 
-            await message.answer("Начинаю обработку…", reply_markup=ReplyKeyboardRemove())
+            checkpoints = CheckpointStore(self.jobs_dir / f"{message.chat.id}-{message.message_id}")
+            await asyncio.to_thread(checkpoints.directory.mkdir, parents=True, exist_ok=True)
+            await asyncio.to_thread(checkpoints.save_job, job)
+            await self.__run_saved_job(job, checkpoints)
 
-            with tempfile.TemporaryDirectory() as tmpdir:
-                progress_message = await message.answer("Получаю файл, пожалуйста подожди.")
-                local_path = Path(tmpdir) / Path(file_id)
-                await self.bot.download_file(tg_file.file_path, local_path)
+    async def __run_saved_job(self, job: TelegramJob, checkpoints: CheckpointStore) -> None:
+        """Job directory is removed when job is finished or failed, but is kept if bot is stopped."""
+        try:
+            await self.__run_job(job, checkpoints.directory, checkpoints)
+        except Exception:
+            await asyncio.to_thread(shutil.rmtree, checkpoints.directory, ignore_errors=True)
+            raise
+        await asyncio.to_thread(shutil.rmtree, checkpoints.directory, ignore_errors=True)
 
-                observer = TelegramProgressObserver(progress_message)
-                csv_path = tmpdir / Path("transcribed.csv")
-                txt_path = tmpdir / Path("transcribed.txt")
-                simple_txt_path = tmpdir / Path("transcribed-simple.txt")
+    async def __run_job(self, job: TelegramJob, workdir: Path, checkpoints: CheckpointStore | None) -> None:
+        chat_id = job["chat_id"]
+        progress_message = await self.bot.send_message(chat_id, "Получаю файл, пожалуйста подожди.")
+        try:
+            local_path = await self.file_fetcher.fetch(job["file_id"], job["file_size"], workdir)
+        except (TelegramFileNotAvailableError, TelegramFileTooBigError):
+            await self.bot.send_message(chat_id, "Ой, кажется не удалось получить файл, попробуй загрузить снова")
+            return
 
-                async with FullOutputPipeline(csv_path, txt_path, simple_txt_path) as output:
-                    pipeline = get_pipeline(
-                        output,
-                        observer,
-                    )
+        observer = TelegramProgressObserver(progress_message)
+        csv_path = workdir / "transcribed.csv"
+        txt_path = workdir / "transcribed.txt"
+        simple_txt_path = workdir / "transcribed-simple.txt"
 
-                    await pipeline.run_pipeline(Path(local_path), speakers)
+        async with FullOutputPipeline(csv_path, txt_path, simple_txt_path) as output:
+            pipeline = self.services.get_pipeline(output, observer)
 
-                await message.answer_document(FSInputFile(csv_path))
-                await message.answer_document(FSInputFile(txt_path))
-                await message.answer_document(FSInputFile(simple_txt_path))
+            await pipeline.run_pipeline(local_path, job["speakers"], checkpoints=checkpoints)
 
-            await state.clear()
+        await self.bot.send_document(chat_id, FSInputFile(csv_path))
+        await self.bot.send_document(chat_id, FSInputFile(txt_path))
+        await self.bot.send_document(chat_id, FSInputFile(simple_txt_path))
+
+    async def __resume_jobs(self) -> None:
+        if self.jobs_dir is None:
+            return
+
+        for checkpoints in await asyncio.to_thread(find_jobs, self.jobs_dir, self.checkpoint_ttl):
+            job: TelegramJob | None = await asyncio.to_thread(checkpoints.load_job)  # pyright: ignore[reportAssignmentType]
+            if job is None:
+                await asyncio.to_thread(shutil.rmtree, checkpoints.directory, ignore_errors=True)
+                continue
+
+            logger.info("Resuming job %s", checkpoints.directory.name)
+            try:
+                await self.bot.send_message(job["chat_id"], "Бот перезапускался, продолжаю обработку файла")
+            except (TelegramForbiddenError, TelegramBadRequest):
+                # user blocked the bot or chat is deleted, nobody waits for the result
+                logger.exception("Job %s is dropped, its chat is not available", checkpoints.directory.name)
+                await asyncio.to_thread(shutil.rmtree, checkpoints.directory, ignore_errors=True)
+                continue
+            self.__track(asyncio.create_task(self.__run_saved_job(job, checkpoints)))
+
+    def __track(self, task: asyncio.Task[None]) -> None:
+        self._resumed_tasks.add(task)
+        task.add_done_callback(self._resumed_tasks.discard)
+
+    def __is_short_note(self, message: Message) -> bool:
+        note = message.voice or message.video_note
+        return note is not None and note.duration <= self.fast_path_max_duration
+
+    async def __transcribe_short_note(self, message: Message, file_id: str, file_size: int | None) -> None:
+        """Voice note almost always has one speaker, so there is no speakers question and diarization."""
+        started = time.monotonic()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                local_path = await self.file_fetcher.fetch(file_id, file_size, Path(tmpdir))
+            except (TelegramFileNotAvailableError, TelegramFileTooBigError):
+                await message.answer("Ой, кажется не удалось получить файл, попробуй загрузить снова")
+                return
+
+            simple_txt_path = Path(tmpdir) / "transcribed-simple.txt"
+            try:
+                async with TxtFileSimpleOutputService(simple_txt_path) as output:
+                    pipeline = self.services.get_pipeline(output, NullProgressObserver())
+                    await pipeline.run_pipeline(local_path, 1, denoise=False, skip_diarization=True)
+            except Exception:
+                logger.exception("Short note transcription failed")
+                await message.answer("Ой, кажется не удалось распознать запись, попробуй загрузить снова")
+                return
+
+            async with aiofiles.open(simple_txt_path, encoding="utf-8") as file:
+                text = (await file.read()).strip()
+
+            if not text:
+                await message.reply("Не удалось распознать речь")  # noqa: RUF001
+            elif len(text) <= MESSAGE_MAX_LENGTH:
+                await message.reply(text)
+            else:
+                await message.reply_document(FSInputFile(simple_txt_path))
+
+        logger.info("Short note transcribed in %.2f s", time.monotonic() - started)
 
-    def __extract_file_id(self, message: Message) -> str | None:  # noqa: PLR0911
+    def __extract_file(self, message: Message) -> tuple[str, int | None] | None:  # noqa: PLR0911
         if message.photo:
-            return message.photo[-1].file_id
+            return message.photo[-1].file_id, message.photo[-1].file_size
         if message.video:
-            return message.video.file_id
+            return message.video.file_id, message.video.file_size
         if message.document:
-            return message.document.file_id
+            return message.document.file_id, message.document.file_size
         if message.audio:
-            return message.audio.file_id
+            return message.audio.file_id, message.audio.file_size
         if message.voice:
-            return message.voice.file_id
+            return message.voice.file_id, message.voice.file_size
         if message.video_note:
-            return message.video_note.file_id
+            return message.video_note.file_id, message.video_note.file_size
 
         return None
 
     async def run(self) -> None:
+        # saved jobs are resumed in background, so the bot answers new messages at once
+        self.__track(asyncio.create_task(self.__resume_jobs()))
         await self.dp.start_polling(self.bot)  # pyright: ignore[reportUnknownMemberType]
 
 
@@ -0,0 +1,70 @@
+import asyncio
+from pathlib import Path
+
+from bulk_integration.bulk_runner import BulkItem, BulkRunner, discover
+from tests.stub_services import STUB_DURATION, get_stub_services
+
+
+def test_discover_directory(tmp_path: Path) -> None:
+    """Media files are found recursively, results keep directory structure."""
+    (tmp_path / "input" / "2024").mkdir(parents=True)
+    (tmp_path / "input" / "2024" / "meeting.mp3").write_bytes(b"1")
+    (tmp_path / "input" / "call.ogg").write_bytes(b"2")
+    (tmp_path / "input" / "notes.pdf").write_bytes(b"3")
+
+    items = discover(tmp_path / "input", tmp_path / "output")
+
+    assert items == [
+        BulkItem(tmp_path / "input" / "2024" / "meeting.mp3", tmp_path / "output" / "2024" / "meeting.mp3"),
+        BulkItem(tmp_path / "input" / "call.ogg", tmp_path / "output" / "call.ogg"),
+    ]
+
+
+def test_discover_manifest(tmp_path: Path) -> None:
+    """Relative paths in manifest are resolved against manifest directory."""
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# archive\nrecords/a.wav\n\n/mnt/b.wav\n", encoding="utf-8")
+
+    items = discover(manifest, tmp_path / "output")
+
+    assert items == [
+        BulkItem(tmp_path / "records" / "a.wav", tmp_path / "output" / "records" / "a.wav"),
+        BulkItem(Path("/mnt/b.wav"), tmp_path / "output" / "_external" / "mnt" / "b.wav"),
+    ]
+
+
+def test_discover_manifest_same_names(tmp_path: Path) -> None:
+    """Files with the same name from different directories get different results."""
+    manifest = tmp_path / "lists" / "manifest.txt"
+    manifest.parent.mkdir()
+    manifest.write_text("/a/rec.wav\n/b/rec.wav\n../rec.wav\nrec.wav\n", encoding="utf-8")
+
+    items = discover(manifest, tmp_path / "output")
+
+    assert [item.output_base for item in items] == [
+        tmp_path / "output" / "_external" / "a" / "rec.wav",
+        tmp_path / "output" / "_external" / "b" / "rec.wav",
+        tmp_path / "output" / "_external" / tmp_path.resolve().relative_to("/") / "rec.wav",
+        tmp_path / "output" / "rec.wav",
+    ]
+
+
+def test_run_skips_done_items(tmp_path: Path) -> None:
+    """Items with results are skipped, others are transcribed."""
+    (tmp_path / "input").mkdir()
+    for name in ("a", "b", "c"):
+        (tmp_path / "input" / f"{name}.wav").write_bytes(name.encode())
+    items = discover(tmp_path / "input", tmp_path / "output")
+    csv_path, txt_path, simple_txt_path = items[0].output_paths()
+    csv_path.parent.mkdir(parents=True)
+    for path in (csv_path, txt_path, simple_txt_path):
+        path.write_text("old", encoding="utf-8")
+
+    report = asyncio.run(BulkRunner(get_stub_services(), inflight=2).run(items))
+
+    assert (report.files_done, report.files_skipped, report.files_failed) == (2, 1, 0)
+    assert report.audio_seconds == 2 * STUB_DURATION
+    assert report.audio_hours_per_hour > 0
+    assert csv_path.read_text(encoding="utf-8") == "old"
+    assert items[1].output_paths()[2].read_text(encoding="utf-8") == "b"
+    assert not list((tmp_path / "output").glob("*.part"))
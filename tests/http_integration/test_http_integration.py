@@ -0,0 +1,164 @@
+import asyncio
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+from aiohttp import FormData
+from aiohttp.test_utils import TestClient, TestServer
+
+from http_integration.http_integration import HttpBatchApp
+from tests.stub_services import get_stub_services
+
+
+def get_app(tmp_path: Path) -> HttpBatchApp:
+    """Return app with stub services."""
+    services = get_stub_services()
+    local_files_dir = tmp_path / "local"
+    local_files_dir.mkdir()
+    return HttpBatchApp(services, tmp_path / "jobs", local_files_dir)
+
+
+async def wait_events(client: TestClient[object, object], job_id: str) -> list[str]:
+    """Read server-sent events till job finished."""
+    response = await client.get(f"/jobs/{job_id}/events")
+    body = await response.text()
+    return [line.removeprefix("event: ") for line in body.splitlines() if line.startswith("event: ")]
+
+
+def test_upload_many_files(tmp_path: Path) -> None:
+    """Every uploaded file becomes a job with results."""
+
+    async def scenario() -> None:
+        async with TestClient(TestServer(get_app(tmp_path).app)) as client:
+            form = FormData()
+            form.add_field("file", b"first", filename="first.ogg")
+            form.add_field("file", b"second", filename="second.ogg")
+            form.add_field("speakers", "2")
+
+            response = await client.post("/jobs", data=form)
+            assert response.status == HTTPStatus.ACCEPTED
+            jobs = (await response.json())["jobs"]
+            assert [job["filename"] for job in jobs] == ["first.ogg", "second.ogg"]
+
+            for job, content in zip(jobs, ["first", "second"], strict=True):
+                events = await wait_events(client, job["id"])
+                assert events[-1] == "done"
+
+                response = await client.get(f"/jobs/{job['id']}/result", params={"format": "json"})
+                assert json.loads(await response.text()) == [
+                    {"from": 0.0, "to": 1.0, "speaker": "SPEAKER_0", "sentence": content},
+                ]
+
+                response = await client.get(f"/jobs/{job['id']}/result", params={"format": "csv"})
+                assert response.status == HTTPStatus.OK
+                assert response.content_type == "text/csv"
+
+    asyncio.run(scenario())
+
+
+def test_local_paths(tmp_path: Path) -> None:
+    """Only paths inside local files dir are accepted."""
+
+    async def scenario() -> None:
+        app = get_app(tmp_path)
+        (tmp_path / "local" / "record.wav").write_bytes(b"local")
+        (tmp_path / "secret.wav").write_bytes(b"secret")
+
+        async with TestClient(TestServer(app.app)) as client:
+            response = await client.post("/jobs", json={"paths": [str(tmp_path / "secret.wav")]})
+            assert response.status == HTTPStatus.BAD_REQUEST
+
+            response = await client.post("/jobs", json={"paths": [str(tmp_path / "local" / "record.wav")]})
+            assert response.status == HTTPStatus.ACCEPTED
+            job_id = (await response.json())["jobs"][0]["id"]
+
+            assert (await wait_events(client, job_id))[-1] == "done"
+            response = await client.get(f"/jobs/{job_id}/result", params={"format": "simple_txt"})
+            assert await response.text() == "local"
+
+            response = await client.delete(f"/jobs/{job_id}")
+            assert response.status == HTTPStatus.NO_CONTENT
+            assert (tmp_path / "local" / "record.wav").exists()
+
+            response = await client.get(f"/jobs/{job_id}")
+            assert response.status == HTTPStatus.NOT_FOUND
+
+    asyncio.run(scenario())
+
+
+def test_resume_after_restart(tmp_path: Path) -> None:
+    """Jobs left by previous process are restored, unfinished ones are run again."""
+
+    async def scenario() -> None:
+        async with TestClient(TestServer(get_app(tmp_path).app)) as client:
+            form = FormData()
+            form.add_field("file", b"first", filename="first.ogg")
+            response = await client.post("/jobs", data=form)
+            done_id = (await response.json())["jobs"][0]["id"]
+            assert (await wait_events(client, done_id))[-1] == "done"
+
+        interrupted = tmp_path / "jobs" / "interrupted"
+        interrupted.mkdir()
+        (interrupted / "source.ogg").write_bytes(b"second")
+        record = {
+            "filename": "second.ogg",
+            "source": str(interrupted / "source.ogg"),
+            "n_speakers": None,
+            "owns_source": True,
+            "status": "running",
+            "error": None,
+        }
+        (interrupted / "job.json").write_text(json.dumps(record))
+
+        app = HttpBatchApp(get_stub_services(), tmp_path / "jobs")
+        resumed = await app.jobs.resume()
+        assert [job.id for job in resumed] == ["interrupted"]
+
+        async with TestClient(TestServer(app.app)) as client:
+            assert (await wait_events(client, "interrupted"))[-1] == "done"
+            response = await client.get("/jobs/interrupted/result", params={"format": "simple_txt"})
+            assert await response.text() == "second"
+
+            response = await client.get(f"/jobs/{done_id}/result", params={"format": "simple_txt"})
+            assert await response.text() == "first"
+
+    asyncio.run(scenario())
+
+
+def test_wrong_upload_leaves_no_files(tmp_path: Path) -> None:
+    """Files written before wrong field of the request are removed."""
+
+    async def scenario() -> None:
+        async with TestClient(TestServer(get_app(tmp_path).app)) as client:
+            form = FormData()
+            form.add_field("file", b"first", filename="first.ogg")
+            form.add_field("speakers", "many")
+            response = await client.post("/jobs", data=form)
+            assert response.status == HTTPStatus.BAD_REQUEST
+
+    asyncio.run(scenario())
+    assert not any((tmp_path / "jobs").iterdir())
+
+
+def test_finished_jobs_expire(tmp_path: Path) -> None:
+    """Jobs finished longer than checkpoint ttl ago are forgotten with their files when new job comes."""
+
+    async def submit(client: TestClient[object, object], content: bytes) -> str:
+        form = FormData()
+        form.add_field("file", content, filename="recording.ogg")
+        response = await client.post("/jobs", data=form)
+        job_id = (await response.json())["jobs"][0]["id"]
+        assert (await wait_events(client, job_id))[-1] == "done"
+        return job_id
+
+    async def scenario() -> None:
+        app = HttpBatchApp(get_stub_services(), tmp_path / "jobs", checkpoint_ttl=0)
+        async with TestClient(TestServer(app.app)) as client:
+            first_id = await submit(client, b"first")
+            second_id = await submit(client, b"second")
+
+            assert (await client.get(f"/jobs/{first_id}")).status == HTTPStatus.NOT_FOUND
+            assert (await client.get(f"/jobs/{second_id}")).status == HTTPStatus.OK
+            assert [path.name for path in (tmp_path / "jobs").iterdir()] == [second_id]
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+import asyncio
+import dataclasses
+from pathlib import Path
+
+from aiofiles.threadpool.binary import AsyncBufferedReader
+
+from load_testing.runner import run_load_test
+from load_testing.scenario import generate_scenario
+from load_testing.stub_services import StubCost, create_stub_services
+from speech_recognition.pipeline.checkpoints import CheckpointStore
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+
+USERS = 8
+
+
+class FailingTranscriptionService:
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        checkpoint: TranscriptionCheckpoint | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Fail like a broken model."""
+        msg = "Model failed"
+        raise RuntimeError(msg)
+
+
+def test_concurrent_uploads() -> None:
+    """Every simulated user gets transcript of each upload, stub workers see every job."""
+    uploads = generate_scenario(USERS, uploads_per_user=2, max_duration=120, seed=1)
+    files = [upload for upload in uploads if upload.kind != "voice"]
+    stubs = create_stub_services(StubCost(), StubCost(0.01), StubCost(0.01), whisper_workers=2)
+
+    try:
+        report = asyncio.run(run_load_test(uploads, stubs, upload_timeout=30))
+    finally:
+        stubs.stop()
+
+    assert not report.failed, str(report)
+    assert len(report.latencies()) == len(uploads)
+    assert len(report.queue_waits["transcription"]) == len(uploads)
+    assert len(report.queue_waits["diarization"]) == len(files)
+    assert report.requests["sendDocument"] == 3 * len(files)
+    assert 1 <= report.peak_inflight <= USERS
+    assert report.peak_rss_bytes >= report.baseline_rss_bytes > 0
+
+
+def test_failed_short_note_is_answered() -> None:
+    """User gets error message instead of waiting forever when short note can not be transcribed."""
+    uploads = generate_scenario(2, voice_share=1.0)
+    stubs = create_stub_services(StubCost(), StubCost(), StubCost())
+    services = dataclasses.replace(stubs.services, transcription=FailingTranscriptionService())
+
+    try:
+        report = asyncio.run(run_load_test(uploads, dataclasses.replace(stubs, services=services), upload_timeout=30))
+    finally:
+        stubs.stop()
+
+    assert len(report.failed) == len(uploads)
+    assert all(result.error and result.error.startswith("Ой") for result in report.failed)
+
+
+def test_resumed_job_of_blocked_chat_is_dropped(tmp_path: Path) -> None:
+    """Saved job of user who blocked the bot does not stop the bot from starting and is removed."""
+    blocked_chat = 1000
+    saved_job = CheckpointStore(tmp_path / f"{blocked_chat}-1")
+    saved_job.directory.mkdir()
+    saved_job.save_job({"chat_id": blocked_chat, "file_id": "gone", "file_size": None, "speakers": None})
+    uploads = generate_scenario(1, voice_share=1.0)
+    stubs = create_stub_services(StubCost(), StubCost(), StubCost())
+
+    try:
+        report = asyncio.run(
+            run_load_test(uploads, stubs, upload_timeout=30, jobs_dir=tmp_path, blocked_chats=(blocked_chat,)),
+        )
+    finally:
+        stubs.stop()
+
+    assert not report.failed, str(report)
+    assert not saved_job.directory.exists()
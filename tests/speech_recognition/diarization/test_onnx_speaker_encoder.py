@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from speech_recognition.diarization.onnx_speaker_encoder import (
+    HOP_LENGTH,
+    N_MELS,
+    SAMPLE_RATE,
+    mel_filters,
+    mel_spectrogram,
+    partial_slices,
+)
+
+
+def test_mel_spectrogram_frames() -> None:
+    """Frames are centered, tone energy falls into filters around its frequency."""
+    time = np.arange(SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+    wav = np.sin(2 * np.pi * 1000 * time).astype(np.float32)
+    filters = mel_filters()
+
+    mel = mel_spectrogram(wav, filters)
+
+    assert mel.shape == (1 + len(wav) // HOP_LENGTH, N_MELS)
+    peak = int(mel.mean(axis=0).argmax())
+    assert filters[peak, round(1000 / (SAMPLE_RATE / 400))] > 0
+
+
+def test_partial_slices() -> None:
+    """Short audio has one partial, last partial is dropped if it is mostly padding."""
+    assert partial_slices(SAMPLE_RATE // 2) == [0]
+    assert partial_slices(int(1.6 * SAMPLE_RATE)) == [0]
+    assert partial_slices(3 * SAMPLE_RATE) == [0, 77, 154]
+    assert partial_slices(int(2.5 * SAMPLE_RATE)) == [0, 77]
+
+
+def test_mel_matches_librosa() -> None:
+    """NumPy frontend is the same as resemblyzer preprocessing."""
+    librosa = pytest.importorskip("librosa")
+    wav = np.random.default_rng(0).standard_normal(SAMPLE_RATE * 2).astype(np.float32) * 0.1
+
+    expected = librosa.feature.melspectrogram(
+        y=wav,
+        sr=SAMPLE_RATE,
+        n_fft=400,
+        hop_length=HOP_LENGTH,
+        n_mels=N_MELS,
+    ).T
+
+    np.testing.assert_allclose(mel_spectrogram(wav, mel_filters()), expected, rtol=1e-4, atol=1e-6)
+
+
+def test_embeddings_match_resemblyzer(tmp_path: Path) -> None:
+    """Exported encoder returns the same embeddings as torch VoiceEncoder."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("torch")
+    resemblyzer = pytest.importorskip("resemblyzer")
+    from speech_recognition.diarization.onnx_speaker_encoder import (  # noqa: PLC0415
+        OnnxSpeakerEncoder,
+        export_voice_encoder,
+    )
+
+    model_path = tmp_path / "voice_encoder.onnx"
+    export_voice_encoder(model_path)
+    encoder = OnnxSpeakerEncoder(model_path)
+    voice_encoder = resemblyzer.VoiceEncoder("cpu", verbose=False)
+
+    rng = np.random.default_rng(0)
+    wavs = [rng.standard_normal(int(seconds * SAMPLE_RATE)).astype(np.float32) * 0.1 for seconds in (0.4, 2.5, 6)]
+
+    expected = np.stack([voice_encoder.embed_utterance(wav) for wav in wavs])
+    np.testing.assert_allclose(encoder.embed_utterances(wavs), expected, atol=1e-5)
@@ -0,0 +1,9 @@
+from speech_recognition.diarization.onnx_speaker_encoder import EMBEDDING_SIZE
+from speech_recognition.diarization.resemblyzer_speaker_encoder import ResemblyzerSpeakerEncoder
+
+
+def test_no_utterances() -> None:
+    """Recording without speech has no embeddings, model is not needed for it."""
+    encoder = ResemblyzerSpeakerEncoder.__new__(ResemblyzerSpeakerEncoder)
+
+    assert encoder.embed_utterances([]).shape == (0, EMBEDDING_SIZE)
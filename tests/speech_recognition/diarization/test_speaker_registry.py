@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import numpy as np
+
+from speech_recognition.diarization.speaker_registry import SpeakerRegistry
+
+
+def voices(count: int, seed: int = 0) -> np.ndarray:
+    """Return random unit vectors."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, 256)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_match_enrolled_speakers(tmp_path: Path) -> None:
+    """Clusters close to enrolled centroids get names, every name is given once."""
+    registry = SpeakerRegistry(tmp_path)
+    enrolled = voices(3)
+    for name, voice in zip(["Анна", "Boris", "Vera"], enrolled, strict=True):
+        registry.enroll(name, np.stack([voice + noise for noise in voices(4, seed=1) * 0.1]))
+
+    clusters = np.stack([enrolled[2], voices(1, seed=2)[0], enrolled[0], enrolled[0] * 0.9 + enrolled[1] * 0.1])
+
+    assert registry.match(clusters, threshold=0.8) == ["Vera", None, "Анна", None]
+
+
+def test_registry_is_shared_between_processes(tmp_path: Path) -> None:
+    """Memory-mapped registry sees speakers enrolled and removed by another instance."""
+    reader = SpeakerRegistry(tmp_path, mmap=True)
+    writer = SpeakerRegistry(tmp_path)
+    assert reader.match(voices(1), threshold=0.8) == [None]
+
+    writer.enroll("Boris", voices(1))
+    writer.enroll("Vera", voices(1, seed=1))
+    writer.enroll("Boris", voices(1, seed=2))
+    assert reader.names == ["Boris", "Vera"]
+    assert reader.match(voices(1, seed=2), threshold=0.8) == ["Boris"]
+
+    assert writer.remove("Boris")
+    assert not writer.remove("Boris")
+    assert reader.match(voices(2, seed=1)[:1], threshold=0.8) == ["Vera"]
+    assert len(reader) == 1
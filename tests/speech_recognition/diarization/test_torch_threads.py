@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parents[3] / "src"
+
+
+def test_interop_threads_can_be_set_again() -> None:
+    """Second service in the process does not fail on inter-op threads set by the first one."""
+    pytest.importorskip("torch")
+    code = (
+        "from speech_recognition.diarization.resemblyzer_with_silero_vad_diarization_service import set_torch_threads\n"
+        "set_torch_threads(1, 2)\n"
+        "set_torch_threads(1, 2)\n"
+        "set_torch_threads(1, 3)\n"
+    )
+
+    # inter-op pool is set once per process, so it is checked in a fresh one
+    subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, check=True)  # noqa: S603
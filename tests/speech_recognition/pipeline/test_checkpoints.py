@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+from aiofiles.threadpool.binary import AsyncBufferedReader
+
+from speech_recognition.pipeline.checkpoints import CheckpointStore, find_jobs
+from speech_recognition.pipeline.progress_observer import NullProgressObserver
+from speech_recognition.pipeline.services import PipelineServices
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+from tests.speech_recognition.pipeline.test_pipeline import FailingDiarizationService, ListOutputService
+from tests.stub_services import StubDiarizationService, StubPreparationService, StubTranscriptionService
+
+
+class FailingTranscriptionService:
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        checkpoint: TranscriptionCheckpoint | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Transcription must not be called."""
+        msg = "Transcription is called"
+        raise AssertionError(msg)
+
+
+def test_finished_stages_are_not_run_again(tmp_path: Path) -> None:
+    """Job interrupted during diarization continues from saved words."""
+    source = tmp_path / "voice.ogg"
+    source.write_bytes(b"hello")
+    checkpoints = CheckpointStore(tmp_path)
+
+    interrupted = PipelineServices(StubPreparationService(), FailingDiarizationService(), StubTranscriptionService())
+    pipeline = interrupted.get_pipeline(ListOutputService(), NullProgressObserver())
+    with pytest.raises(AssertionError):
+        asyncio.run(pipeline.run_pipeline(source, None, checkpoints=checkpoints))
+
+    output = ListOutputService()
+    restarted = PipelineServices(StubPreparationService(), StubDiarizationService(), FailingTranscriptionService())
+    pipeline = restarted.get_pipeline(output, NullProgressObserver())
+    asyncio.run(pipeline.run_pipeline(source, None, checkpoints=checkpoints))
+
+    assert output.rows == [(0.0, 1.0, "hello", "SPEAKER_0")]
+
+
+def test_partial_checkpoint(tmp_path: Path) -> None:
+    """Partial words are saved with offset and removed when stage is finished."""
+    checkpoints = CheckpointStore(tmp_path)
+    partial = checkpoints.partial("words")
+    assert partial.load() is None
+
+    partial.save(ColumnarTranscript.from_rows([0.0], [1.0], [" hello"]), 1.5)
+    loaded = partial.load()
+    assert loaded is not None
+    assert loaded[0].texts() == [" hello"]
+    assert loaded[1] == pytest.approx(1.5)
+
+    checkpoints.save("words", ColumnarTranscript.from_rows([0.0, 2.0], [1.0, 3.0], [" hello", " world"]))
+    assert partial.load() is None
+
+
+def test_find_jobs_removes_expired(tmp_path: Path) -> None:
+    """Old job directories are removed, others are returned."""
+    fresh = tmp_path / "fresh"
+    expired = tmp_path / "expired"
+    for directory in (fresh, expired):
+        directory.mkdir()
+        CheckpointStore(directory).save_job({"id": directory.name})
+
+    old = time.time() - 3600
+    os.utime(expired, (old, old))
+
+    jobs = find_jobs(tmp_path, ttl=60)
+
+    assert [job.load_job() for job in jobs] == [{"id": "fresh"}]
+    assert not expired.exists()
@@ -0,0 +1,105 @@
+import asyncio
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from aiofiles.threadpool.binary import AsyncBufferedReader
+
+from speech_recognition.pipeline.progress_observer import NullProgressObserver
+from speech_recognition.pipeline.services import PipelineServices
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+from tests.stub_services import StubDiarizationService, StubPreparationService, StubTranscriptionService
+
+
+class ListOutputService:
+    def __init__(self) -> None:  # noqa: D107
+        self.rows: list[tuple[float, float, str, str]] = []
+
+    async def __aenter__(self) -> Self:  # noqa: D105
+        return self
+
+    async def __aexit__(  # noqa: D105
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
+
+    async def output(self, time_from: float, time_to: float, sentence: str, speaker_title: str) -> None:
+        self.rows.append((time_from, time_to, sentence, speaker_title))
+
+    async def output_bulk(self, transcript: ColumnarTranscript) -> None:
+        self.rows.extend(transcript.rows())
+
+
+class FailingDiarizationService:
+    async def get_segments_from_file(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        n_speakers: int | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Diarization must not be called."""
+        msg = "Diarization is called"
+        raise AssertionError(msg)
+
+
+class TwoWordsTranscriptionService:
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        checkpoint: TranscriptionCheckpoint | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Return two words far from each other."""
+        return ColumnarTranscript.from_rows([0.0, 10.0], [1.0, 11.0], ["hello", " again"])
+
+
+class TwoSegmentsDiarizationService:
+    async def get_segments_from_file(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        n_speakers: int | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Return two segments of one speaker."""
+        return ColumnarTranscript.from_rows([0.0, 10.0], [1.0, 11.0], ["", ""], [0, 0], ("SPEAKER_0",))
+
+
+def run(
+    tmp_path: Path,
+    services: PipelineServices,
+    n_speakers: int | None,
+    *,
+    skip_diarization: bool = False,
+) -> list[tuple[float, float, str, str]]:
+    """Run pipeline for file with text "hello"."""
+    source = tmp_path / "voice.ogg"
+    source.write_bytes(b"hello")
+    output = ListOutputService()
+    pipeline = services.get_pipeline(output, NullProgressObserver())
+    asyncio.run(pipeline.run_pipeline(source, n_speakers, skip_diarization=skip_diarization))
+    return output.rows
+
+
+def test_skip_diarization(tmp_path: Path) -> None:
+    """All words are output as one segment."""
+    services = PipelineServices(StubPreparationService(), FailingDiarizationService(), StubTranscriptionService())
+
+    assert run(tmp_path, services, 1, skip_diarization=True) == [(0.0, 1.0, "hello", "SPEAKER_0")]
+
+
+def test_single_speaker_uses_diarization(tmp_path: Path) -> None:
+    """Long recording of one speaker is still split by diarization segments."""
+    services = PipelineServices(
+        StubPreparationService(),
+        TwoSegmentsDiarizationService(),
+        TwoWordsTranscriptionService(),
+    )
+
+    assert run(tmp_path, services, 1) == [(0.0, 1.0, "hello", "SPEAKER_0"), (10.0, 11.0, " again", "SPEAKER_0")]
+
+
+def test_many_speakers_use_diarization(tmp_path: Path) -> None:
+    """Words are grouped by diarization segments."""
+    services = PipelineServices(StubPreparationService(), StubDiarizationService(), StubTranscriptionService())
+
+    assert run(tmp_path, services, None) == [(0.0, 1.0, "hello", "SPEAKER_0")]
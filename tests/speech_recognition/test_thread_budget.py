@@ -0,0 +1,25 @@
+from speech_recognition.thread_budget import VAD_THREADS, ThreadBudget
+
+
+def test_split_does_not_oversubscribe() -> None:
+    """Stages together use no more threads than cores."""
+    for cpu_threads in (2, 4, 8, 16, 64):
+        for whisper_workers in (1, 2, 4):
+            budget = ThreadBudget.split(cpu_threads, whisper_workers)
+
+            assert budget.whisper_threads >= 1
+            assert budget.diarization_threads >= 1
+            assert budget.total <= max(cpu_threads, whisper_workers + 1 + VAD_THREADS)
+
+
+def test_split_keeps_explicit_threads() -> None:
+    """Explicit thread counts are not changed."""
+    budget = ThreadBudget.split(16, whisper_workers=2, whisper_threads=3, diarization_threads=5)
+
+    assert budget == ThreadBudget(
+        whisper_workers=2,
+        whisper_threads=3,
+        diarization_threads=5,
+        diarization_interop_threads=1,
+    )
+    assert ThreadBudget().total == 0
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import numpy as np
+
+from speech_recognition.interval_storage.intervaltree_storage_service import IntervalTreeStorageService
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript, align
+
+WORDS = ColumnarTranscript.from_rows(
+    [0.0, 0.5, 1.0, 2.0, 2.0, 3.5],
+    [0.5, 1.0, 1.5, 2.0, 3.0, 4.0],
+    [" привет", " hello", " world", "", " again", " bye"],
+)
+
+
+def test_slice_time_shares_memory() -> None:
+    """Slice by time returns rows overlapping interval without copying columns."""
+    part = WORDS.slice_time(0.7, 2.5)
+
+    assert part.texts() == [" hello", " world", "", " again"]
+    assert part.joined_text() == " hello world again"
+    assert np.shares_memory(part.start, WORDS.start)
+    assert part.text is WORDS.text
+
+
+def test_negative_index() -> None:
+    """Negative index returns row from the end like for lists."""
+    assert WORDS[-1] == (3.5, 4.0, " bye", "SPEAKER_UNKNOWN")
+    assert WORDS.text_at(-2) == " again"
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Transcript is the same after round trip, slices are saved without the rest of buffer."""
+    path = tmp_path / "words.npz"
+    segments = ColumnarTranscript.from_rows([0.0, 1.0], [1.0, 2.0], ["a", "b"], [1, -1], ("SPEAKER_0", "SPEAKER_1"))
+
+    segments[1:].save(path)
+    loaded = ColumnarTranscript.load(path)
+
+    assert list(loaded.rows()) == [(1.0, 2.0, "b", "SPEAKER_UNKNOWN")]
+    assert loaded.speaker_labels == ("SPEAKER_0", "SPEAKER_1")
+
+
+def test_align_matches_interval_tree() -> None:
+    """Every segment gets the same words as interval tree lookup returns."""
+    segments = ColumnarTranscript.from_rows(
+        [0.0, 0.75, 2.0, 4.0, 5.0],
+        [0.75, 2.0, 3.6, 5.0, 6.0],
+        [""] * 5,
+        [0, 1, 0, 1, 0],
+        ("SPEAKER_0", "SPEAKER_1"),
+    )
+    storage = IntervalTreeStorageService()
+    for time_from, time_to, word, _ in WORDS.rows():
+        storage.store(time_from, time_to, word)
+
+    aligned = align(WORDS, segments)
+
+    assert aligned.texts() == ["".join(storage.get(start, end)) for start, end, _, _ in segments.rows()]
+    assert [speaker for _, _, _, speaker in aligned.rows()] == [
+        "SPEAKER_0",
+        "SPEAKER_1",
+        "SPEAKER_0",
+        "SPEAKER_1",
+        "SPEAKER_0",
+    ]
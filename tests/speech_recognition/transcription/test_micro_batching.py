@@ -0,0 +1,92 @@
+import queue
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.micro_batching import (
+    SAMPLE_RATE,
+    collect_batch,
+    concatenate,
+    keep_speech,
+    restore_time,
+    split_words,
+)
+
+
+def get_from(tasks: "queue.Queue[int]") -> Callable[[float], int | None]:
+    """Return getter for collect_batch."""
+
+    def get_next(timeout: float) -> int | None:
+        try:
+            return tasks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    return get_next
+
+
+def test_collect_batch_defers_long_tasks() -> None:
+    """Short tasks are collected till batch is full, long ones are returned separately."""
+    long_task = 100
+    tasks: queue.Queue[int] = queue.Queue()
+    for task in (2, long_task, 3, 4, 5):
+        tasks.put(task)
+
+    batch, deferred = collect_batch(1, get_from(tasks), lambda task: task != long_task, batch_size=4, max_wait=1.0)
+
+    assert batch == [1, 2, 3, 4]
+    assert deferred == [long_task]
+    assert tasks.qsize() == 1
+
+
+def test_collect_batch_waits_no_longer_than_max_wait() -> None:
+    """Batch is returned after max_wait even if it is not full."""
+    tasks: queue.Queue[int] = queue.Queue()
+    tasks.put(2)
+
+    batch, deferred = collect_batch(1, get_from(tasks), lambda _: True, batch_size=8, max_wait=0.05)
+
+    assert batch == [1, 2]
+    assert deferred == []
+
+
+def test_concatenate_and_split_words() -> None:
+    """Words of joined audio are returned to their jobs with relative time."""
+    first = np.ones(2 * SAMPLE_RATE, dtype=np.float32)
+    second = np.ones(3 * SAMPLE_RATE, dtype=np.float32)
+
+    audio, clips = concatenate([first, second], gap=1.0)
+
+    assert len(audio) == 7 * SAMPLE_RATE
+    assert clips == [(0.0, 2.0), (3.0, 6.0)]
+
+    words = ColumnarTranscript.from_rows([0.1, 0.6, 3.5], [0.5, 2.2, 4.0], [" hello", " world", " second"])
+    first_words, second_words = split_words(words, clips)
+
+    assert first_words.texts() == [" hello", " world"]
+    assert first_words.start.tolist() == pytest.approx([0.1, 0.6])
+    assert first_words.end.tolist() == pytest.approx([0.5, 2.0])
+    assert second_words.texts() == [" second"]
+    assert second_words.start.tolist() == pytest.approx([0.5])
+    assert second_words.end.tolist() == pytest.approx([1.0])
+
+
+def test_keep_speech_and_restore_time() -> None:
+    """Words of speech-only audio get time of original audio."""
+    audio = np.arange(10 * SAMPLE_RATE, dtype=np.float32)
+    chunks = [{"start": 1 * SAMPLE_RATE, "end": 3 * SAMPLE_RATE}, {"start": 6 * SAMPLE_RATE, "end": 8 * SAMPLE_RATE}]
+
+    speech = keep_speech(audio, chunks)
+
+    assert len(speech) == 4 * SAMPLE_RATE
+    assert speech[2 * SAMPLE_RATE] == audio[6 * SAMPLE_RATE]
+    assert len(keep_speech(audio, [])) == 0
+
+    words = ColumnarTranscript.from_rows([0.5, 1.5, 2.0], [1.0, 2.0, 3.5], [" one", " two", " three"])
+    restored = restore_time(words, chunks)
+
+    assert restored.texts() == [" one", " two", " three"]
+    assert restored.start.tolist() == pytest.approx([1.5, 2.5, 6.0])
+    assert restored.end.tolist() == pytest.approx([2.0, 3.0, 7.5])
@@ -0,0 +1,56 @@
+"""Fast stubs of pipeline services for tests."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import aiofiles
+from aiofiles.threadpool.binary import AsyncBufferedReader
+
+from speech_recognition.pipeline.services import PipelineServices
+from speech_recognition.transcript.columnar_transcript import ColumnarTranscript
+from speech_recognition.transcription.interfaces import TranscriptionCheckpoint
+
+STUB_DURATION = 60.0
+
+
+class StubPreparationService:
+    @asynccontextmanager
+    async def get_prepared_file(
+        self,
+        filename: Path,
+        *,
+        denoise: bool = True,  # noqa: ARG002
+    ) -> AsyncIterator[AsyncBufferedReader]:
+        """Return file as is."""
+        async with aiofiles.open(filename, "rb") as file:
+            yield file
+
+    async def get_duration(self, filename: Path) -> float:  # noqa: ARG002
+        """Return the same duration for every file."""
+        return STUB_DURATION
+
+
+class StubTranscriptionService:
+    async def transcribe(
+        self,
+        file: AsyncBufferedReader,
+        checkpoint: TranscriptionCheckpoint | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Return file content as one word."""
+        return ColumnarTranscript.from_rows([0.0], [1.0], [(await file.read()).decode()])
+
+
+class StubDiarizationService:
+    async def get_segments_from_file(
+        self,
+        file: AsyncBufferedReader,  # noqa: ARG002
+        n_speakers: int | None = None,  # noqa: ARG002
+    ) -> ColumnarTranscript:
+        """Return one segment."""
+        return ColumnarTranscript.from_rows([0.0], [1.0], [""], [0], ("SPEAKER_0",))
+
+
+def get_stub_services() -> PipelineServices:
+    """Return services which do not load any model."""
+    return PipelineServices(StubPreparationService(), StubDiarizationService(), StubTranscriptionService())
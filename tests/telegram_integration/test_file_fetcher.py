@@ -0,0 +1,111 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+from telegram_integration.exceptions import TelegramFileNotAvailableError, TelegramFileTooBigError
+from telegram_integration.file_fetcher import TelegramFileFetcher
+
+TOKEN = "42:TEST"  # noqa: S105
+CONTENT = b"recording"
+
+
+class StubBotApiServer:
+    """Minimal Bot API server: getFile and file downloading."""
+
+    def __init__(self, file_path: str) -> None:  # noqa: D107
+        self.file_path = file_path
+        self.requests: list[str] = []
+        self._app = web.Application()
+        self._app.router.add_post(f"/bot{TOKEN}/getFile", self._get_file)
+        self._app.router.add_get(f"/file/bot{TOKEN}/{{path:.+}}", self._download)
+        self._runner = web.AppRunner(self._app)
+        self.base_url = ""
+
+    async def start(self) -> None:
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    async def _get_file(self, request: web.Request) -> web.Response:
+        self.requests.append("getFile")
+        data = await request.post()
+        result: dict[str, Any] = {
+            "file_id": data["file_id"],
+            "file_unique_id": "unique",
+            "file_size": len(CONTENT),
+            "file_path": self.file_path,
+        }
+        return web.json_response({"ok": True, "result": result})
+
+    async def _download(self, _: web.Request) -> web.Response:
+        self.requests.append("download")
+        return web.Response(body=CONTENT)
+
+
+async def fetch(server: StubBotApiServer, workdir: Path, file_size: int | None, *, is_local: bool) -> Path:
+    """Run fetcher against stub server."""
+    await server.start()
+    bot = Bot(TOKEN, session=AiohttpSession(api=TelegramAPIServer.from_base(server.base_url, is_local=is_local)))
+    try:
+        return await TelegramFileFetcher(bot).fetch("file-id", file_size, workdir)
+    finally:
+        await bot.session.close()
+        await server.stop()
+
+
+def test_download_from_public_api(tmp_path: Path) -> None:
+    """File is downloaded into workdir."""
+    server = StubBotApiServer("voice/file_0.oga")
+
+    path = asyncio.run(fetch(server, tmp_path, len(CONTENT), is_local=False))
+
+    assert path.parent == tmp_path
+    assert path.read_bytes() == CONTENT
+    assert server.requests == ["getFile", "download"]
+
+
+def test_local_mode_uses_file_in_place(tmp_path: Path) -> None:
+    """File on local disk is not downloaded and not copied."""
+    server_file = tmp_path / "server" / "voice" / "file_0.oga"
+    server_file.parent.mkdir(parents=True)
+    server_file.write_bytes(CONTENT)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    server = StubBotApiServer(str(server_file))
+
+    path = asyncio.run(fetch(server, workdir, 3 * TelegramFileFetcher.PUBLIC_API_DOWNLOAD_LIMIT, is_local=True))
+
+    assert path == server_file
+    assert not any(workdir.iterdir())
+    assert server.requests == ["getFile"]
+
+
+def test_local_mode_missing_file(tmp_path: Path) -> None:
+    """File missing on local disk is not downloaded, it would resolve to the same path."""
+    server = StubBotApiServer(str(tmp_path / "server" / "voice" / "file_0.oga"))
+
+    with pytest.raises(TelegramFileNotAvailableError):
+        asyncio.run(fetch(server, tmp_path, len(CONTENT), is_local=True))
+
+    assert server.requests == ["getFile"]
+
+
+def test_too_big_file_is_not_requested(tmp_path: Path) -> None:
+    """Public Bot API can not give big files, so nothing is requested."""
+    server = StubBotApiServer("video/file_1.mp4")
+
+    with pytest.raises(TelegramFileTooBigError):
+        asyncio.run(fetch(server, tmp_path, TelegramFileFetcher.PUBLIC_API_DOWNLOAD_LIMIT + 1, is_local=False))
+
+    assert server.requests == []
@@ -0,0 +1,66 @@
+"""Startup time guard.
+
+Importing entrypoints must not load model libraries, they are imported by model worker threads.
+Run `python -X importtime -c "import app_factory"` from src directory to see what is slow.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+ENTRYPOINT_MODULES = ("app_factory", "main", "bulk")
+HEAVY_PACKAGES = frozenset(
+    {"torch", "librosa", "sklearn", "resemblyzer", "silero_vad", "faster_whisper", "ctranslate2", "onnxruntime"},
+)
+# aiogram builds all Bot API models on import, it is imported only when the bot is created
+TELEGRAM_MODULE = "telegram_integration.telegram_integration"
+IMPORT_TIME_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", "1000"))
+TELEGRAM_IMPORT_TIME_BUDGET_MS = int(os.environ.get("TELEGRAM_IMPORT_TIME_BUDGET_MS", "6000"))
+BUDGETS_MS = {
+    **dict.fromkeys(ENTRYPOINT_MODULES, IMPORT_TIME_BUDGET_MS),
+    TELEGRAM_MODULE: TELEGRAM_IMPORT_TIME_BUDGET_MS,
+}
+
+
+def import_times(modules: str) -> list[tuple[int, int, str]]:
+    """Return (cumulative us, depth, module) for every module imported by `import modules`."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    rows: list[tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+
+    return rows
+
+
+def test_heavy_libraries_are_not_imported() -> None:
+    """Model libraries are not imported by entrypoints, aiogram is not imported by http api and bulk workers."""
+    imported = {name.split(".")[0] for _, _, name in import_times(", ".join(ENTRYPOINT_MODULES))}
+
+    assert not imported & HEAVY_PACKAGES
+    assert "aiogram" not in imported
+
+
+@pytest.mark.parametrize("module", list(BUDGETS_MS))
+def test_import_time_budget(module: str) -> None:
+    """Import of every entrypoint is fast, run with IMPORT_TIME_BUDGET_MS and TELEGRAM_IMPORT_TIME_BUDGET_MS env.
+
+    Telegram bot module is imported by create_telegram_app and has own budget because of aiogram.
+    """
+    total = next(cumulative for cumulative, depth, name in import_times(module) if depth == 0 and name == module)
+
+    assert total / 1000 < BUDGETS_MS[module]